@@ -0,0 +1,36 @@
+"""revoked token expiry
+
+Revision ID: 4256926e7595
+Revises: 76271fc1650f
+Create Date: 2026-10-17 11:48:05.903117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4256926e7595'
+down_revision: Union[str, Sequence[str], None] = '76271fc1650f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('revoked_tokens', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    # the jwt exp of existing rows is unknown; keep them for a day, which
+    # outlives any access token issued before this migration
+    op.execute("UPDATE revoked_tokens SET expires_at = revoked_at + interval '1 day'")
+    op.alter_column('revoked_tokens', 'expires_at', nullable=False)
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_revoked_tokens_jti'), 'revoked_tokens', ['jti'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_jti'), table_name='revoked_tokens')
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_column('revoked_tokens', 'expires_at')
@@ -0,0 +1,40 @@
+"""hash session refresh tokens
+
+Revision ID: 76271fc1650f
+Revises: c81bbe53953d
+Create Date: 2026-10-17 11:02:19.552873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '76271fc1650f'
+down_revision: Union[str, Sequence[str], None] = 'c81bbe53953d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('refresh_token_hash', sa.String(length=64), nullable=True))
+    op.execute(
+        "UPDATE sessions SET refresh_token_hash = "
+        "encode(sha256(convert_to(refresh_token, 'UTF8')), 'hex')"
+    )
+    op.alter_column('sessions', 'refresh_token_hash', nullable=False)
+    op.create_index(op.f('ix_sessions_refresh_token_hash'), 'sessions', ['refresh_token_hash'], unique=True)
+    op.drop_column('sessions', 'refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the raw tokens cannot be recovered; old sessions keep only their hash
+    op.add_column('sessions', sa.Column('refresh_token', sa.TEXT(), nullable=True))
+    op.execute("UPDATE sessions SET refresh_token = refresh_token_hash")
+    op.alter_column('sessions', 'refresh_token', nullable=False)
+    op.drop_index(op.f('ix_sessions_refresh_token_hash'), table_name='sessions')
+    op.drop_column('sessions', 'refresh_token_hash')
@@ -0,0 +1,53 @@
+"""soft delete and fk indexes
+
+Revision ID: 904677c567eb
+Revises: 4256926e7595
+Create Date: 2026-10-17 15:02:37.514880
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '904677c567eb'
+down_revision: Union[str, Sequence[str], None] = '4256926e7595'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text('is_deleted = false')
+
+# name, table, columns, partial predicate
+INDEXES = [
+    ('ix_orders_customer_id_created_at', 'orders', ['customer_id', sa.text('created_at DESC')], LIVE),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], None),
+    ('ix_medicine_batches_medicine_id', 'medicine_batches', ['medicine_id'], None),
+    ('ix_prescriptions_customer_id_uploaded_at', 'prescriptions', ['customer_id', sa.text('uploaded_at DESC')], LIVE),
+    ('ix_addresses_user_id', 'addresses', ['user_id'], LIVE),
+    ('ix_medicines_medicine_id_live', 'medicines', ['medicine_id'], LIVE),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, and
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=where, postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
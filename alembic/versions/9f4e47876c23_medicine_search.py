@@ -0,0 +1,64 @@
+"""medicine search
+
+Revision ID: 9f4e47876c23
+Revises: 904677c567eb
+Create Date: 2026-10-17 18:41:09.215377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4e47876c23'
+down_revision: Union[str, Sequence[str], None] = '904677c567eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', medicine_name), 'A') || "
+    "setweight(to_tsvector('simple', generic_name), 'A') || "
+    "setweight(to_tsvector('simple', manufacturer), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')"
+)
+
+# name, table, column, operator class
+INDEXES = [
+    ('ix_medicines_search_vector', 'medicines', 'search_vector', None),
+    ('ix_medicines_medicine_name_trgm', 'medicines', 'medicine_name', 'gin_trgm_ops'),
+    ('ix_medicines_generic_name_trgm', 'medicines', 'generic_name', 'gin_trgm_ops'),
+    ('ix_categories_category_name_trgm', 'categories', 'category_name', 'gin_trgm_ops'),
+    ('ix_tags_name_trgm', 'tags', 'name', 'gin_trgm_ops'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # a stored generated column rewrites medicines under an exclusive lock;
+    # schedule this revision for a quiet window on a large catalogue
+    op.add_column('medicines', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True,
+    ))
+    with op.get_context().autocommit_block():
+        for name, table, column, ops in INDEXES:
+            op.create_index(
+                name, table, [column], unique=False, postgresql_using='gin',
+                postgresql_ops={column: ops} if ops else {},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+    op.drop_column('medicines', 'search_vector')
@@ -0,0 +1,37 @@
+"""unlogged otp codes
+
+Revision ID: c81bbe53953d
+Revises: a23e15d0d8f9
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81bbe53953d'
+down_revision: Union[str, Sequence[str], None] = 'a23e15d0d8f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('otp_codes',
+    sa.Column('phone_number', sa.String(length=20), nullable=False),
+    sa.Column('code_hash', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('phone_number'),
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('ix_otp_codes_expires_at', 'otp_codes', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_otp_codes_expires_at', table_name='otp_codes')
+    op.drop_table('otp_codes')
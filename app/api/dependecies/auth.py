@@ -1,18 +1,29 @@
+import hashlib
 import uuid
-from datetime import datetime, timedelta
-from typing import Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Tuple, Union
 
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import false, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.dependecies.get_db_sessions import get_postgres
 from app.core.config import settings
 from app.core.database import async_session
+from app.core.password_hasher import password_hasher
+from app.core.permission_registry import (
+    SCOPE_CLAIM,
+    decode_mask,
+    encode_mask,
+    permission_mask,
+    permission_registry,
+)
+from app.core.principal_cache import Principal, principal_cache
+from app.core.token_cache import access_token_cache
+from app.core.token_revocation import revoked_tokens
 from app.models.user_management_models import (
     Permission,
     RevokedToken,
@@ -26,7 +37,7 @@ R_SECRET_KEY = settings.REFRESH_SECRET_TOKEN
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRES
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = password_hasher.context
 
 
 async def load_scopes_from_db():
@@ -47,31 +58,41 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await password_hasher.verify(plain, hashed)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
-def create_access_token(user: User) -> str:
+def scope_mask(user: Union[User, Principal]) -> int:
+    if isinstance(user, Principal):
+        return user.permission_mask
+    return permission_mask(user.role.permissions)
+
+
+def create_access_token(user: Union[User, Principal]) -> str:
     jti = str(uuid.uuid4())
     payload = {
         "sub": str(user.user_id),
-        "scopes": [perm.name for perm in user.role.permissions],
+        SCOPE_CLAIM: encode_mask(scope_mask(user)),
         "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
         "jti": jti,
     }
     return jwt.encode(payload, A_SECRET_KEY, algorithm=ALGORITHM)
 
 
-def create_refresh_token(user: User) -> Tuple[str, datetime]:
+def create_refresh_token(user: Union[User, Principal]) -> Tuple[str, datetime]:
     jti = str(uuid.uuid4())
     expiration_dt = datetime.utcnow() + timedelta(minutes=REFRESH_TOKEN_EXPIRE_DAYS)
     payload = {
         "sub": str(user.user_id),
-        "scopes": [perm.name for perm in user.role.permissions],
+        SCOPE_CLAIM: encode_mask(scope_mask(user)),
         "exp": expiration_dt,
         "jti": jti,
     }
@@ -87,9 +108,9 @@ async def is_token_revoked(db: AsyncSession, jti: str) -> bool:
     return True
 
 
-async def revoke_token(db: AsyncSession, jti: str):
+async def revoke_token(db: AsyncSession, jti: str, expires_at: float):
     if not await is_token_revoked(db, jti):
-        db.add(RevokedToken(jti=jti))
+        await revoked_tokens.revoke(db, jti, expires_at)
         await db.commit()
 
 
@@ -97,7 +118,7 @@ async def get_current_user(
     security_scopes: SecurityScopes,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_postgres),
-):
+) -> Principal:
     authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,66 +126,110 @@ async def get_current_user(
         headers={"WWW-Authenticate": authenticate_value},
     )
     try:
-        payload = jwt.decode(token, A_SECRET_KEY, algorithms=[ALGORITHM])
+        payload = access_token_cache.decode(token)
         user_id = payload.get("sub")
-        token_scopes = payload.get("scopes", [])
+        token_mask = decode_mask(payload.get(SCOPE_CLAIM))
         jti = payload.get("jti")
         if user_id is None or jti is None:
             raise credentials_exception
         user_id = int(user_id)
-    except JWTError:
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    if await is_token_revoked(db, jti):
+    if revoked_tokens.contains(jti) or (
+        not revoked_tokens.ready and await is_token_revoked(db, jti)
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked. Please log in again.",
         )
 
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.role).selectinload(Role.permissions))
-        .filter(User.user_id == user_id)
-    )
-    user = result.scalar_one_or_none()
-    if not user:
+    principal = await principal_cache.load(db, user_id)
+    if principal is None or not principal.is_active:
         raise credentials_exception
 
-    db_permissions = [perm.name for perm in user.role.permissions]
-    required_scopes = set(security_scopes.scopes)
-    granted_scopes = set(token_scopes) | set(db_permissions)
-
-    missing_scopes = required_scopes - granted_scopes
-    if missing_scopes:
+    if permission_registry.stale:
+        await permission_registry.load(db)
+    if "scopes" in payload:
+        token_mask |= permission_registry.mask_of_names(payload["scopes"])
+    required = permission_registry.compile(security_scopes.scopes)
+    missing_mask = required.mask & ~(token_mask | principal.permission_mask)
+    if missing_mask or required.unknown:
+        missing_scopes = sorted(
+            required.unknown | set(permission_registry.names_of(missing_mask))
+        )
         raise HTTPException(
             status_code=403,
             detail=f"Missing required permissions: {', '.join(missing_scopes)}",
         )
 
-    return user
-
-
-async def rotate_refresh_token(old_token: str, db: AsyncSession) -> str:
-    # result = await db.execute(
-    #     select(RefreshToken)
-    #     .where(RefreshToken.token == old_token)
-    #     .where(RefreshToken.revoked == False)
-    # )
-    # db_token = result.scalar_one_or_none()
-    #
-    # if not db_token:
-    #     raise HTTPException(status_code=401, detail="Invalid refresh token")
-    #
-    # if db_token.expires_at < datetime.utcnow():
-    #     raise HTTPException(status_code=401, detail="Refresh token expired")
-    #
-    # # revoke old token
-    # db_token.revoked = True
-    # await db.commit()
-    #
-    # # issue a new one
-    # result = await db.execute(select(User).where(User.user_id == db_token.user_id))
-    # user = result.scalar_one()
-    # new_token = await create_refresh_token(user, db)
-    # return new_token
-    pass
+    # end the auth lookups' transaction so the connection goes back to the
+    # pool instead of idling until the handler (often on a replica) is done
+    if db.in_transaction():
+        await db.commit()
+    return principal
+
+
+async def rotate_refresh_token(
+    old_token: str, db: AsyncSession
+) -> Tuple[str, str, int]:
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+    )
+    try:
+        payload = jwt.decode(old_token, R_SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        raise invalid_token
+
+    principal = await principal_cache.load(db, user_id)
+    if principal is None or not principal.is_active:
+        raise invalid_token
+
+    access_token = create_access_token(principal)
+    refresh_token, expires_at = create_refresh_token(principal)
+
+    # revoke the presented session and insert its successor in one statement
+    revoked = (
+        update(Session)
+        .where(
+            Session.refresh_token_hash == hash_refresh_token(old_token),
+            Session.user_id == user_id,
+            Session.is_revoked == false(),
+            Session.expires_at > func.now(),
+        )
+        .values(is_revoked=True)
+        .returning(Session.user_id, Session.device_info, Session.ip_address)
+        .cte("revoked")
+    )
+    successor = select(
+        revoked.c.user_id,
+        literal(hash_refresh_token(refresh_token)),
+        revoked.c.device_info,
+        revoked.c.ip_address,
+        literal(expires_at.replace(tzinfo=timezone.utc), Session.expires_at.type),
+        false(),
+    )
+    result = await db.execute(
+        insert(Session)
+        .from_select(
+            [
+                Session.user_id,
+                Session.refresh_token_hash,
+                Session.device_info,
+                Session.ip_address,
+                Session.expires_at,
+                Session.is_revoked,
+            ],
+            successor,
+        )
+        .add_cte(revoked)
+        .returning(Session.session_id)
+    )
+    session_id = result.scalar_one_or_none()
+    if session_id is None:
+        await db.rollback()
+        raise invalid_token
+    await db.commit()
+    return access_token, refresh_token, session_id
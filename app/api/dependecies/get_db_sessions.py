@@ -1,10 +1,44 @@
-from app.core.database import async_session
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import Request
+
+from app.core.database import async_session, get_bucket
+from app.core.db_pool import record_session_usage
+from app.core.read_replicas import replica_router
+
+if TYPE_CHECKING:
+    from app.services.file_service import FileService
+
+_file_manager: Optional["FileService"] = None
 
 
 async def get_postgres():
-    async with async_session() as session:
-        yield session
+    session = async_session()
+    try:
+        async with session:
+            yield session
+    finally:
+        record_session_usage(session)
+
+
+async def get_postgres_read(request: Request):
+    session = replica_router.session_factory(request)()
+    try:
+        async with session:
+            yield session
+    finally:
+        record_session_usage(session)
 
 
 async def get_mongo():
-    pass
+    return get_bucket()
+
+
+def get_file_manager() -> "FileService":
+    # built on first use, like the bucket it works on
+    global _file_manager
+    if _file_manager is None:
+        from app.services.file_service import FileService
+
+        _file_manager = FileService()
+    return _file_manager
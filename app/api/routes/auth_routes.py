@@ -9,12 +9,13 @@ from sqlalchemy.future import select
 from app.api.dependecies.auth import get_current_user, oauth2_scheme
 from app.api.dependecies.get_db_sessions import get_postgres
 from app.core.config import settings
-from app.core.database import otp_store
+from app.core.otp_store import otp_store
 from app.schemas.user_schemas import (
     AdminCreate,
     AdminResponse,
     ForgotPasswordRequest,
     OtpRequest,
+    RefreshTokenRequest,
     ResetPasswordRequest,
     UserCreate,
 )
@@ -79,8 +80,7 @@ async def reset_password(
 @router.post("/get-otp", description="Generate and send an OTP for phone verification")
 async def get_otp(data: OtpRequest):
     otp = random.randint(100000, 999999)
-    expiry = datetime.utcnow() + timedelta(minutes=5)
-    otp_store[data.phone_number] = {"otp": str(otp), "expires": expiry}
+    await otp_store.issue(data.phone_number, str(otp))
     print(f"otp : {otp} sent")
     return JSONResponse(status_code=200, content={"msg": "otp sent successfully"})
 
@@ -89,7 +89,15 @@ async def get_otp(data: OtpRequest):
 async def user_login(
     request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_postgres)
 ):
-    result = auth.LOGIN_USER(request=request, user_data=user_data, db=db)
+    result = await auth.LOGIN_USER(request=request, user_data=user_data, db=db)
+    return result
+
+
+@router.post("/refresh", description="Rotate a refresh token and issue a new token pair")
+async def refresh_token(
+    data: RefreshTokenRequest, db: AsyncSession = Depends(get_postgres)
+):
+    result = await auth.REFRESH_TOKEN(refresh_token=data.refresh_token, db=db)
     return result
 
 
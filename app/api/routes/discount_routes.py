@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependecies.auth import get_current_user
 from app.api.dependecies.get_db_sessions import get_postgres
-from app.models.user_management_models import User
+from app.core.principal_cache import Principal
 from app.schemas import discount_schemas
 from app.schemas.discount_schemas import (
     CouponCreate,
@@ -32,8 +32,11 @@ async def list_discount_types(
     current_user=Security(get_current_user, scopes=["admin:read"]),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
-    result = await discount_manager.LIST_DISCOUNT_TYPE(db=db, skip=skip, limit=limit)
+    result = await discount_manager.LIST_DISCOUNT_TYPE(
+        db=db, skip=skip, limit=limit, cursor=cursor
+    )
     return result
 
 
@@ -66,7 +69,7 @@ async def update_discount_type(
 async def soft_delete_discount_type(
     id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.SOFT_DELETE_DISCOUNT_TYPE(
         db=db, user_id=current_user.user_id, discount_type_id=id
@@ -84,9 +87,10 @@ async def list_discounts(
     current_user=Security(get_current_user, scopes=["admin:read"]),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
     result = await discount_manager.LIST_ALL_DISCOUNTS(
-        db=db, skip=skip, limit=limit, is_active=is_active
+        db=db, skip=skip, limit=limit, is_active=is_active, cursor=cursor
     )
     return result
 
@@ -116,7 +120,7 @@ async def update_discount(
     discount_id: int = Path(...),
     discount: DiscountUpdate = Body(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.UPDATE_DISCOUNT(
         db=db,
@@ -131,7 +135,7 @@ async def update_discount(
 async def soft_delete_discount(
     discount_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.SOFT_DELETE_DISCOUNT(
         db=db, discount_id=discount_id, user_id=current_user.user_id
@@ -174,7 +178,7 @@ async def add_discount_parameter(
 async def delete_discount_parameter(
     parameter_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.DELETE_PARAMETER(
         db=db, parameter_id=parameter_id, user_id=current_user.user_id
@@ -190,7 +194,7 @@ async def update_dicount_paramter(
     parameter_id: int = Path(...),
     parameter_data: DiscountParamterCreate = Body(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.UPDATE_PARAMETER(
         db=db,
@@ -237,7 +241,7 @@ async def remove_discount_medicine(
     discount_id: int = Path(...),
     medicine_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.REMOVE_DISCOUNT_MEDICINE(
         db=db,
@@ -256,7 +260,7 @@ async def remove_discount_category(
     discount_id: int = Path(...),
     category_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.REMOVE_DISCOUNT_CATEGORY(
         db=db,
@@ -319,7 +323,7 @@ async def get_coupon_details(
 async def soft_delete_coupon(
     coupon_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await discount_manager.SOFT_DELETE_COUPON(
         db=db, coupon_id=coupon_id, deleted_by=current_user.user_id
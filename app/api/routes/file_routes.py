@@ -1,17 +1,17 @@
 import json
 from typing import List
 
-from bson import ObjectId
 from fastapi import APIRouter, Depends, File, HTTPException, Path, Request, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependecies.get_db_sessions import get_postgres
-from app.core.database import bucket
-from app.services.file_service import FileService
+from app.api.dependecies.get_db_sessions import (
+    get_file_manager,
+    get_mongo,
+    get_postgres,
+)
 
 router = APIRouter(prefix="/files", tags=["Files Testing"])
-file_manager = FileService()
 
 
 @router.get("/dev", description="Health check endpoint for Files routes")
@@ -26,6 +26,8 @@ async def upload_file(
     user_id: int = Path(...),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_postgres),
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
 ):
     result = await file_manager.UPLOAD_SINGLE_FILE(
         bucket=bucket, db=db, file=file, user_id=user_id
@@ -34,7 +36,11 @@ async def upload_file(
 
 
 @router.get("/downloadfile/{file_id}", description="Download/stream a file by its ID")
-async def downloadfile(file_id: str):
+async def downloadfile(
+    file_id: str,
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
+):
     result = await file_manager.DOWNLOAD_SINGLE_FILE(bucket=bucket, file_id=file_id)
     return result
 
@@ -44,6 +50,8 @@ async def upload_multiple_files(
     user_id: int = Path(...),
     files: List[UploadFile] = File(...),
     db: AsyncSession = Depends(get_postgres),
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
 ):
     result = await file_manager.UPLOAD_MULTIPLE_FILES(
         bucket=bucket, db=db, files=files, user_id=user_id
@@ -55,6 +63,8 @@ async def upload_multiple_files(
 async def download_multiple_files(
     file_ids: List[str],
     db: AsyncSession = Depends(get_postgres),
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
 ):
     result = await file_manager.DOWNLOAD_MULTIPLE_FILES(
         bucket=bucket, file_ids=file_ids
@@ -5,9 +5,12 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependecies.auth import get_current_user, oauth2_scheme
-from app.api.dependecies.get_db_sessions import get_postgres
-from app.core.database import bucket
-from app.models.user_management_models import User
+from app.api.dependecies.get_db_sessions import (
+    get_mongo,
+    get_postgres,
+    get_postgres_read,
+)
+from app.core.principal_cache import Principal
 from app.schemas.inventory_schemas import (
     AlternativeCreate,
     CategoryCreate,
@@ -17,12 +20,10 @@ from app.schemas.inventory_schemas import (
     SideEffectCreate,
     TagCreate,
 )
-from app.services.file_service import FileService
 from app.services.inventory_service import InventoryManagementService
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
 inventory_manager = InventoryManagementService()
-file_manager = FileService()
 
 medicine_router = APIRouter(prefix="/medicines", tags=["Medicines"])
 category_router = APIRouter(prefix="/categories", tags=["Categories"])
@@ -42,10 +43,11 @@ async def get_root_dev():
     "/upload-single-image/{medicine_id}", description="Upload a single medicine image"
 )
 async def upload_single_image(
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
     file: UploadFile = File(...),
     medicine_id: int = Path(...),
+    bucket=Depends(get_mongo),
 ):
     result = await inventory_manager.UPLOAD_MEDICINE_IMAGE(
         db=db,
@@ -72,19 +74,45 @@ async def create_medicine(
 )
 async def get_all_medicines(
     current_user=Security(get_current_user, scopes=["admin:read"]),
-    db: AsyncSession = Depends(get_postgres),
+    db: AsyncSession = Depends(get_postgres_read),
     name: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
+    search: Optional[str] = Query(
+        None,
+        min_length=2,
+        description="ranked full-text and fuzzy name search, paged with skip",
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
     result = await inventory_manager.GET_MEDICINES(
-        db=db, name=name, category=category, tag=tag, skip=skip, limit=limit
+        db=db,
+        name=name,
+        category=category,
+        tag=tag,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        search=search,
     )
     return result
 
 
+@medicine_router.get(
+    "/suggest", description="Autocomplete medicine and generic names as you type"
+)
+async def suggest_medicines(
+    current_user=Security(get_current_user, scopes=["user:read"]),
+    db: AsyncSession = Depends(get_postgres_read),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+):
+    result = await inventory_manager.SUGGEST_MEDICINES(db=db, q=q, limit=limit)
+    return result
+
+
 @medicine_router.get(
     "/{medicine_id}", description="Get details of a specific medicine by ID"
 )
@@ -113,7 +141,7 @@ async def update_medicine(
 @medicine_router.delete("/{medicine_id}", description="Soft delete a medicine by ID")
 async def soft_delete_medicine(
     medicine_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_MEDICINE(
@@ -179,11 +207,14 @@ async def create_category(
 @category_router.get("/", description="List all categories with pagination")
 async def list_all_categories(
     current_user=Security(get_current_user, scopes=["admin:read"]),
-    db: AsyncSession = Depends(get_postgres),
+    db: AsyncSession = Depends(get_postgres_read),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
-    result = await inventory_manager.GET_ALL_CATEGORIES(db=db, skip=skip, limit=limit)
+    result = await inventory_manager.GET_ALL_CATEGORIES(
+        db=db, skip=skip, limit=limit, cursor=cursor
+    )
     return result
 
 
@@ -213,7 +244,7 @@ async def update_category(
 @category_router.delete("/{category_id}", description="Soft delete a category by ID")
 async def soft_delete_category(
     category_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_CATEGORY(
@@ -235,11 +266,14 @@ async def create_tag(
 @tags_router.get("/", description="List all tags with pagination")
 async def list_all_tags(
     current_user=Security(get_current_user, scopes=["admin:read"]),
-    db: AsyncSession = Depends(get_postgres),
+    db: AsyncSession = Depends(get_postgres_read),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
-    result = await inventory_manager.LIST_ALL_TAGS(db=db, skip=skip, limit=limit)
+    result = await inventory_manager.LIST_ALL_TAGS(
+        db=db, skip=skip, limit=limit, cursor=cursor
+    )
     return result
 
 
@@ -267,7 +301,7 @@ async def update_tag(
 @tags_router.delete("/{tag_id}", description="Soft delete a tag by ID")
 async def soft_delete_tag(
     tag_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_TAG(
@@ -294,9 +328,10 @@ async def list_all_side_effects(
     db: AsyncSession = Depends(get_postgres),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
     result = await inventory_manager.LIST_ALL_SIDE_EFFECTS(
-        db=db, skip=skip, limit=limit
+        db=db, skip=skip, limit=limit, cursor=cursor
     )
     return result
 
@@ -333,7 +368,7 @@ async def update_side_effect(
 )
 async def soft_delete_side_effect(
     side_effect_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_SIDE_EFFECT(
@@ -357,7 +392,7 @@ async def create_alternative(
 @alternates_router.get("/{alternative_id}", description="Get alternative details by ID")
 async def get_alternatives_by_id(
     alternative_id: int,
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.GET_ALTERNATIVE_BY_ID(
@@ -372,9 +407,10 @@ async def list_all_alternatives(
     db: AsyncSession = Depends(get_postgres),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
     result = await inventory_manager.LIST_ALL_ALTERNATIVES(
-        db=db, skip=skip, limit=limit
+        db=db, skip=skip, limit=limit, cursor=cursor
     )
     return result
 
@@ -397,7 +433,7 @@ async def update_alternative(
 )
 async def soft_delete_alternative(
     alternative_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_ALTERNATIVE(
@@ -422,8 +458,11 @@ async def list_all_gst_slabs(
     db: AsyncSession = Depends(get_postgres),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
-    result = await inventory_manager.LIST_ALL_GST_SLABS(db=db, skip=skip, limit=limit)
+    result = await inventory_manager.LIST_ALL_GST_SLABS(
+        db=db, skip=skip, limit=limit, cursor=cursor
+    )
     return result
 
 
@@ -453,7 +492,7 @@ async def update_gst_slab(
 @gst_router.delete("/{hsn_code}", description="Soft delete a GST slab by HSN code")
 async def soft_delete_gst_slab(
     hsn_code: str = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_GST_SLAB(
@@ -484,9 +523,10 @@ async def list_all_batches(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
     medicine_id: int = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
 ):
     result = await inventory_manager.GET_MEDICINE_BATCHES(
-        db=db, skip=skip, limit=limit, medicine_id=medicine_id
+        db=db, skip=skip, limit=limit, medicine_id=medicine_id, cursor=cursor
     )
     return result
 
@@ -517,7 +557,7 @@ async def update_batch(
 @batches_router.delete("/{batch_id}", description="Soft delete a batch by ID")
 async def soft_delete_batch(
     batch_id: int = Path(...),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
     db: AsyncSession = Depends(get_postgres),
 ):
     result = await inventory_manager.SOFT_DELETE_BATCH(
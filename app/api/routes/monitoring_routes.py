@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Security
+from fastapi.responses import JSONResponse
+
+from app.api.dependecies.auth import get_current_user
+from app.core.metrics import metrics
+from app.core.slow_queries import slow_query_log
+from app.core.sql_stats import route_sql_stats
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+
+
+@router.get("/metrics", description="Metrics snapshot of the worker serving this call")
+async def get_metrics(
+    current_user=Security(get_current_user, scopes=["admin:read"]),
+):
+    return JSONResponse(status_code=200, content=metrics.snapshot())
+
+
+@router.get(
+    "/sql", description="Statements, db time and N+1 flags per route on this worker"
+)
+async def get_sql_stats(
+    current_user=Security(get_current_user, scopes=["admin:read"]),
+):
+    return JSONResponse(status_code=200, content=route_sql_stats.snapshot())
+
+
+@router.get(
+    "/slow-queries",
+    description="Most recent slow statements on this worker, newest first",
+)
+async def get_slow_queries(
+    current_user=Security(get_current_user, scopes=["admin:read"]),
+):
+    return JSONResponse(status_code=200, content=slow_query_log.entries())
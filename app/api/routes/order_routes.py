@@ -4,10 +4,13 @@ from fastapi import APIRouter, Body, Depends, File, Path, Query, Security, Uploa
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependecies.auth import get_current_user
-from app.api.dependecies.get_db_sessions import get_postgres
-from app.core.database import bucket
+from app.api.dependecies.get_db_sessions import (
+    get_mongo,
+    get_postgres,
+    get_postgres_read,
+)
+from app.core.principal_cache import Principal
 from app.models.enums import OrderStatusEnum
-from app.models.user_management_models import User
 from app.schemas.inventory_schemas import VerifyPrescription
 from app.schemas.order_schemas import OrderCreate, OrderItemCreate, OrderItemUpdate
 from app.services.order_management_service import OrderService
@@ -25,7 +28,8 @@ order_manager = OrderService()
 async def upload_prescription(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
+    bucket=Depends(get_mongo),
 ):
     result = await order_manager.UPLOAD_PRESCRIPTION(
         db=db, file=file, customer_id=current_user.user_id, bucket=bucket
@@ -41,11 +45,12 @@ async def get_customer_prescriptions(
     customer_id: int = Path(...),
     skip: int = Query(0, ge=0, description="range"),
     limit: int = Query(10, ge=1, le=50, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:read"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:read"]),
 ):
     result = await order_manager.GET_CUSTOMER_PRESCRIPTIONS(
-        db=db, customer_id=customer_id, skip=skip, limit=limit
+        db=db, customer_id=customer_id, skip=skip, limit=limit, cursor=cursor
     )
     return result
 
@@ -73,7 +78,7 @@ async def verify_prescription(
     prescription_id: int = Path(...),
     prescription_data: VerifyPrescription = Body(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await order_manager.VERIFY_PRESCRIPTION(
         db=db,
@@ -92,7 +97,7 @@ async def soft_delete_prescription(
     prescription_id: int = Path(...),
     deleted_by: Optional[int] = Body(None, embed=True),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = order_manager.SOFT_DELETE_PRESCRIPTION(
         db=db, prescription_id=prescription_id, deleted_by=current_user.user_id
@@ -128,11 +133,12 @@ async def get_customer_orders(
     customer_id: int = Path(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
-    db: AsyncSession = Depends(get_postgres),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_postgres_read),
     current_user=Security(get_current_user, scopes=["admin:read"]),
 ):
     result = await order_manager.GET_CUSTOMER_ORDERS(
-        db=db, customer_id=customer_id, skip=skip, limit=limit
+        db=db, customer_id=customer_id, skip=skip, limit=limit, cursor=cursor
     )
     return result
 
@@ -154,7 +160,7 @@ async def update_order_status(
 async def soft_delete_order(
     order_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await order_manager.SOFT_DELETE_ORDER(
         db=db, order_id=order_id, deleted_by=current_user.user_id
@@ -207,7 +213,7 @@ async def update_order_item(
 async def soft_delete_order_item(
     order_item_id: int = Path(...),
     db: AsyncSession = Depends(get_postgres),
-    current_user: User = Security(get_current_user, scopes=["admin:write"]),
+    current_user: Principal = Security(get_current_user, scopes=["admin:write"]),
 ):
     result = await order_manager.SOFT_DELETE_ORDER_ITEM(
         db=db, order_item_id=order_item_id, deleted_by=current_user.user_id
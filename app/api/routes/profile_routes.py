@@ -5,8 +5,11 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependecies.auth import get_current_user
-from app.api.dependecies.get_db_sessions import get_postgres
-from app.core.database import bucket
+from app.api.dependecies.get_db_sessions import (
+    get_file_manager,
+    get_mongo,
+    get_postgres,
+)
 from app.schemas.user_schemas import (
     AddressResponse,
     AdminProfileCreate,
@@ -14,12 +17,10 @@ from app.schemas.user_schemas import (
     CustomerProfileCreate,
     CustomerProfileResponse,
 )
-from app.services.file_service import FileService
 from app.services.profile_service import ProfileService
 
 router = APIRouter(prefix="/profile", tags=["Profiles"])
 profile = ProfileService()
-file_manager = FileService()
 
 
 @router.get("/dev", description="Health check endpoint for Profile routes")
@@ -50,6 +51,8 @@ async def upload_admin_pic(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_postgres),
     current_user=Security(get_current_user, scopes=["admin:write"]),
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
 ):
     result = await file_manager.UPLOAD_SINGLE_FILE(
         bucket=bucket, db=db, user_id=admin_id, file=file
@@ -97,6 +100,8 @@ async def upload_customer_pic(
     file: UploadFile = File(...),
     customer_id: int = Path(...),
     current_user=Security(get_current_user, scopes=["user:write"]),
+    bucket=Depends(get_mongo),
+    file_manager=Depends(get_file_manager),
 ):
     result = await file_manager.UPLOAD_SINGLE_FILE(
         bucket=bucket, file=file, user_id=customer_id, db=db
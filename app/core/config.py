@@ -5,6 +5,18 @@ class Settings(BaseSettings):
     APP_NAME: str = ""
     APP_VERSION: str = ""
     DB_URL: str = ""
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    SCHEMA_STARTUP_MODE: str = "verify"
+    DB_READ_REPLICA_URLS: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_SECONDS: int = 5
     ACCESS_SECRET_TOKEN: str = ""
     REFRESH_SECRET_TOKEN: str = ""
     ALGORITHM: str = ""
@@ -15,6 +27,23 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     MONGO_DB_URL: str = ""
     MONGO_DB_NAME: str = ""
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_SIZE: int = 4096
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MEMORY_KIB: int = 65536
+    PASSWORD_HASH_REHASH_TOLERANCE: float = 2.0
+    OTP_STORE_BACKEND: str = "memory"
+    OTP_TTL_SECONDS: int = 300
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_MAX_ENTRIES: int = 100000
+    MAINTENANCE_INTERVAL_SECONDS: int = 3600
+    MAINTENANCE_BATCH_SIZE: int = 1000
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN: bool = False
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -1,25 +1,61 @@
-from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.db_pool import InstrumentedAsyncPool
 
 """
 POSTGRES
 """
-engine = create_async_engine(settings.DB_URL, echo=True, future=True)
+engine_options = dict(
+    echo=settings.DB_ECHO,
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+)
+engine = create_async_engine(
+    settings.DB_URL, poolclass=InstrumentedAsyncPool, **engine_options
+)
 async_session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
 
-otp_store = {}
-
 """
 MONGO
 """
 
-client = AsyncIOMotorClient(settings.MONGO_DB_URL)
-mongo_db = client[settings.MONGO_DB_NAME]
-bucket = AsyncIOMotorGridFSBucket(mongo_db)
+# created on first use so workers and tools that never touch GridFS (alembic,
+# scripts, most requests) skip importing motor/pymongo and opening a client
+_mongo_client = None
+_bucket = None
+
+
+def get_mongo_client():
+    global _mongo_client
+    if _mongo_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        _mongo_client = AsyncIOMotorClient(settings.MONGO_DB_URL)
+    return _mongo_client
+
+
+def get_bucket():
+    global _bucket
+    if _bucket is None:
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+        _bucket = AsyncIOMotorGridFSBucket(get_mongo_client()[settings.MONGO_DB_NAME])
+    return _bucket
+
+
+def close_mongo() -> None:
+    global _mongo_client, _bucket
+    if _mongo_client is not None:
+        _mongo_client.close()
+    _mongo_client = None
+    _bucket = None
@@ -0,0 +1,95 @@
+from time import perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import metrics
+
+WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+IN_USE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+HOLD_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+
+checkout_wait = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "time to obtain a pooled connection, including connect and pre-ping",
+    WAIT_BUCKETS,
+)
+in_use_at_checkout = metrics.histogram(
+    "db_pool_in_use_connections",
+    "connections checked out of this worker's pool, sampled at each checkout",
+    IN_USE_BUCKETS,
+)
+checked_out = metrics.gauge(
+    "db_pool_checked_out", "connections currently checked out of this worker's pool"
+)
+capacity = metrics.gauge(
+    "db_pool_capacity", "pool_size + max_overflow, the most connections a worker opens"
+)
+checkout_timeouts = metrics.counter(
+    "db_pool_timeouts_total", "checkouts that gave up after pool_timeout"
+)
+transaction_hold = metrics.histogram(
+    "db_transaction_hold_seconds",
+    "time a session held its connection, from BEGIN to commit/rollback/close",
+    HOLD_BUCKETS,
+)
+request_hold = metrics.histogram(
+    "db_request_hold_seconds",
+    "connection time of a request's session, summed over its transactions",
+    HOLD_BUCKETS,
+)
+unused_sessions = metrics.counter(
+    "db_sessions_unused_total", "request sessions closed without touching the db"
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that exports checkout wait and in-use counts, so a
+    worker's share of Postgres max_connections can be sized from data.
+    """
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        capacity.set(pool_size + max(max_overflow, 0))
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            checkout_timeouts.inc()
+            raise
+        finally:
+            checkout_wait.observe(perf_counter() - started_at)
+        in_use = self.checkedout()
+        in_use_at_checkout.observe(in_use)
+        checked_out.set(in_use)
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        checked_out.set(self.checkedout())
+
+
+@event.listens_for(OrmSession, "after_begin")
+def _connection_acquired(session, transaction, connection):
+    session.info.setdefault("acquired_at", perf_counter())
+
+
+@event.listens_for(OrmSession, "after_transaction_end")
+def _connection_released(session, transaction):
+    if transaction.parent is not None or "acquired_at" not in session.info:
+        return
+    held = perf_counter() - session.info.pop("acquired_at")
+    transaction_hold.observe(held)
+    session.info["hold_seconds"] = session.info.get("hold_seconds", 0.0) + held
+    session.info["transactions"] = session.info.get("transactions", 0) + 1
+
+
+def record_session_usage(session) -> None:
+    if not session.info.get("transactions"):
+        unused_sessions.inc()
+        return
+    request_hold.observe(session.info["hold_seconds"])
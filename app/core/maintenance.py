@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models.user_management_models import (
+    OtpCode,
+    PasswordReset,
+    RevokedToken,
+    Session,
+)
+
+logger = logging.getLogger(__name__)
+
+# arbitrary constant shared by every worker so only one of them prunes at a time
+PRUNE_LOCK_KEY = 0x6D656469636F
+
+revoked_tokens = RevokedToken.__table__.c
+sessions = Session.__table__.c
+password_reset = PasswordReset.__table__.c
+otp_codes = OtpCode.__table__.c
+
+PRUNE_TARGETS = {
+    "revoked_tokens": (
+        revoked_tokens.revoked_token_id,
+        revoked_tokens.expires_at < func.now(),
+    ),
+    "sessions": (sessions.session_id, sessions.expires_at < func.now()),
+    # password_reset.expires_at is a naive UTC timestamp
+    "password_reset": (
+        password_reset.id,
+        (password_reset.used == True)
+        | (password_reset.expires_at < func.timezone("utc", func.now())),
+    ),
+    "otp_codes": (otp_codes.phone_number, otp_codes.expires_at < func.now()),
+}
+
+pruned_rows = {
+    table: metrics.counter(
+        f"maintenance_pruned_{table}_total", f"expired rows deleted from {table}"
+    )
+    for table in PRUNE_TARGETS
+}
+prune_runs = metrics.counter(
+    "maintenance_prune_runs_total", "prune passes that acquired the advisory lock"
+)
+
+
+class MaintenanceJob:
+    """
+    Periodically deletes auth rows that are past their expiry. Deletes run in
+    primary-key batches of `batch_size`, each in its own short transaction,
+    so the job never holds long locks on hot tables. A session-level advisory
+    lock makes sure only one worker prunes per interval.
+    """
+
+    def __init__(self, interval_seconds: int, batch_size: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def _prune_table(self, conn: AsyncConnection, table: str) -> int:
+        pk, expired = PRUNE_TARGETS[table]
+        total = 0
+        while True:
+            batch = select(pk).where(expired).limit(self.batch_size)
+            result = await conn.execute(delete(pk.table).where(pk.in_(batch)))
+            await conn.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+            await asyncio.sleep(0)
+
+    async def run_once(self) -> Optional[Dict[str, int]]:
+        async with engine.connect() as conn:
+            locked = await conn.scalar(
+                select(func.pg_try_advisory_lock(PRUNE_LOCK_KEY))
+            )
+            await conn.commit()
+            if not locked:
+                return None
+            try:
+                reclaimed = {}
+                for table in PRUNE_TARGETS:
+                    reclaimed[table] = await self._prune_table(conn, table)
+                    pruned_rows[table].inc(reclaimed[table])
+            finally:
+                # a failed batch leaves the transaction aborted, and the
+                # unlock would fail with it and keep the lock on a pooled
+                # connection
+                await conn.rollback()
+                try:
+                    await conn.execute(select(func.pg_advisory_unlock(PRUNE_LOCK_KEY)))
+                    await conn.commit()
+                except Exception as e:
+                    # closing the session is the other way to drop the lock
+                    logger.warning(f"[maintenance] advisory unlock failed : {e}")
+                    await conn.invalidate()
+        prune_runs.inc()
+        logger.info(f"[maintenance] pruned expired rows : {reclaimed}")
+        return reclaimed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[maintenance] prune failed : {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+maintenance = MaintenanceJob(
+    settings.MAINTENANCE_INTERVAL_SECONDS, settings.MAINTENANCE_BATCH_SIZE
+)
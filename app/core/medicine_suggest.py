@@ -0,0 +1,261 @@
+import json
+import logging
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, select
+
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.core.pg_listener import pg_listener
+from app.models.inventory_management_models import Medicine
+
+logger = logging.getLogger(__name__)
+
+indexed_medicines = metrics.gauge(
+    "medicine_suggest_entries", "medicines held by the autocomplete index"
+)
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.casefold()))
+
+
+def word_keys(text: str) -> List[str]:
+    # every word suffix, so "dolo 500 mg" is found by "dolo", "500" and "mg"
+    words = text.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+def trigrams(text: str) -> Set[str]:
+    # padded like pg_trgm: two spaces before each word, one after
+    grams = set()
+    for word in text.split(" "):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class MedicineSuggestIndex:
+    """
+    Per-worker autocomplete over live medicine names and generic names.
+    Prefix matches come from a sorted array of (word suffix, medicine_id)
+    searched with bisect; a trigram map catches misspellings when the
+    prefixes run short. Built from a streamed query on every listener
+    (re)connect and kept current by `medicine_changes` notifications, which
+    carry the names so applying one needs no database read.
+    """
+
+    CHANNEL = "medicine_changes"
+    # prefix rows scanned per query; a one-letter prefix matches thousands
+    MAX_CANDIDATES = 200
+    # trigrams in more entries than this share skip the fuzzy pass
+    COMMON_TRIGRAM_SHARE = 0.05
+    # share of the query's trigrams an entry must contain
+    MIN_SIMILARITY = 0.5
+    BUILD_BATCH = 5000
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[str, str]] = {}
+        self._normalized: Dict[int, Tuple[str, str]] = {}
+        self._keys: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._entry_trigrams: Dict[int, FrozenSet[str]] = {}
+        self._loaded = False
+        self._pending: Optional[List[dict]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded and pg_listener.is_listening
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_keys(medicine_id: int, normalized: Tuple[str, str]):
+        return {(key, medicine_id) for text in normalized for key in word_keys(text)}
+
+    def _add(self, medicine_id: int, name: str, generic: str) -> Set[Tuple[str, int]]:
+        normalized = (normalize(name), normalize(generic))
+        self._entries[medicine_id] = (name, generic)
+        self._normalized[medicine_id] = normalized
+        grams = frozenset(trigrams(" ".join(normalized)))
+        self._entry_trigrams[medicine_id] = grams
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(medicine_id)
+        return self._entry_keys(medicine_id, normalized)
+
+    def upsert(self, medicine_id: int, name: str, generic: str) -> None:
+        if self._entries.get(medicine_id) == (name, generic):
+            return
+        self.remove(medicine_id)
+        for key in self._add(medicine_id, name, generic):
+            insort(self._keys, key)
+        indexed_medicines.set(len(self._entries))
+
+    def remove(self, medicine_id: int) -> None:
+        if self._entries.pop(medicine_id, None) is None:
+            return
+        normalized = self._normalized.pop(medicine_id)
+        for key in self._entry_keys(medicine_id, normalized):
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+        for gram in self._entry_trigrams.pop(medicine_id, ()):
+            ids = self._trigrams[gram]
+            ids.discard(medicine_id)
+            if not ids:
+                del self._trigrams[gram]
+        indexed_medicines.set(len(self._entries))
+
+    def _apply(self, change: dict) -> None:
+        if change["op"] == "upsert":
+            self.upsert(change["id"], change["name"], change["generic"])
+        else:
+            self.remove(change["id"])
+
+    def handle_notification(self, payload: str) -> None:
+        change = json.loads(payload)
+        if self._pending is not None:
+            # a rebuild is streaming; replay once its snapshot is in place
+            self._pending.append(change)
+            return
+        self._apply(change)
+
+    async def rebuild(self) -> None:
+        self._pending = []
+        try:
+            # built aside and swapped in whole; the stream hands the loop back
+            # between partitions, so requests are served while it indexes
+            fresh = MedicineSuggestIndex()
+            keys: List[Tuple[str, int]] = []
+            async with engine.connect() as conn:
+                result = await conn.stream(
+                    select(
+                        Medicine.medicine_id,
+                        Medicine.medicine_name,
+                        Medicine.generic_name,
+                    )
+                    .where(Medicine.is_deleted == False)
+                    .execution_options(yield_per=self.BUILD_BATCH)
+                )
+                async for partition in result.partitions():
+                    for medicine_id, name, generic in partition:
+                        keys.extend(fresh._add(medicine_id, name, generic))
+            # one sort over the whole catalogue instead of an insort per row
+            keys.sort()
+            self._entries, self._normalized = fresh._entries, fresh._normalized
+            self._trigrams = fresh._trigrams
+            self._entry_trigrams = fresh._entry_trigrams
+            self._keys = keys
+            for change in self._pending:
+                self._apply(change)
+            self._loaded = True
+            indexed_medicines.set(len(self._entries))
+            logger.info(f"[medicine-suggest] indexed {len(self._entries)} medicines")
+        finally:
+            self._pending = None
+
+    def _prefix_matches(self, query: str) -> List[int]:
+        ids: Dict[int, None] = {}
+        i = bisect_left(self._keys, (query,))
+        while i < len(self._keys) and len(ids) < self.MAX_CANDIDATES:
+            key, medicine_id = self._keys[i]
+            if not key.startswith(query):
+                break
+            ids[medicine_id] = None
+            i += 1
+        return list(ids)
+
+    def _fuzzy_matches(self, query: str, exclude: Set[int]) -> List[int]:
+        grams = trigrams(query)
+        common = max(1, int(len(self._entries) * self.COMMON_TRIGRAM_SHARE))
+        shared: Counter = Counter()
+        for gram in grams:
+            ids = self._trigrams.get(gram, ())
+            if len(ids) <= common:
+                shared.update(ids)
+        scored = [
+            (count / len(grams), medicine_id)
+            for medicine_id, count in shared.items()
+            if medicine_id not in exclude and count / len(grams) >= self.MIN_SIMILARITY
+        ]
+        scored.sort(key=lambda s: (-s[0], len(self._entries[s[1]][0]), s[1]))
+        return [medicine_id for _, medicine_id in scored]
+
+    def suggest(self, text: str, limit: int = 10) -> List[dict]:
+        query = normalize(text)
+        if not query:
+            return []
+        ids = self._prefix_matches(query)
+
+        def rank(medicine_id: int):
+            # whole-name prefixes before matches on a later word
+            name, generic = self._normalized[medicine_id]
+            starts = name.startswith(query) or generic.startswith(query)
+            return (not starts, len(name), name, medicine_id)
+
+        ids.sort(key=rank)
+        ids = ids[:limit]
+        if len(ids) < limit and len(query) >= 3:
+            ids += self._fuzzy_matches(query, set(ids))[: limit - len(ids)]
+        return [
+            {
+                "medicine_id": medicine_id,
+                "medicine_name": self._entries[medicine_id][0],
+                "generic_name": self._entries[medicine_id][1],
+            }
+            for medicine_id in ids
+        ]
+
+
+medicine_suggest = MedicineSuggestIndex()
+pg_listener.subscribe(
+    MedicineSuggestIndex.CHANNEL,
+    medicine_suggest.handle_notification,
+    on_connect=medicine_suggest.rebuild,
+)
+
+
+def _notify(connection, change: dict) -> None:
+    # delivered on commit, to this worker's listener as well
+    connection.execute(
+        select(func.pg_notify(MedicineSuggestIndex.CHANNEL, json.dumps(change)))
+    )
+
+
+def _upsert_change(target: Medicine) -> dict:
+    return {
+        "op": "upsert",
+        "id": target.medicine_id,
+        "name": target.medicine_name,
+        "generic": target.generic_name,
+    }
+
+
+@event.listens_for(Medicine, "after_insert")
+def _medicine_inserted(mapper, connection, target):
+    if not target.is_deleted:
+        _notify(connection, _upsert_change(target))
+
+
+@event.listens_for(Medicine, "after_update")
+def _medicine_updated(mapper, connection, target):
+    state = inspect(target)
+    if not any(
+        state.attrs[attr].history.has_changes()
+        for attr in ("medicine_name", "generic_name", "is_deleted")
+    ):
+        return
+    if target.is_deleted:
+        _notify(connection, {"op": "delete", "id": target.medicine_id})
+    else:
+        _notify(connection, _upsert_change(target))
+
+
+@event.listens_for(Medicine, "after_delete")
+def _medicine_deleted(mapper, connection, target):
+    _notify(connection, {"op": "delete", "id": target.medicine_id})
@@ -0,0 +1,246 @@
+import hashlib
+import hmac
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Dict, List, Set
+
+from fastapi import HTTPException
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.metrics import metrics
+from app.models.user_management_models import OtpCode
+
+stored_otps = metrics.gauge("otp_store_entries", "otps held by the in-process store")
+rejected_otps = metrics.counter(
+    "otp_issue_rejected_total", "otp requests rejected for capacity or lockout"
+)
+
+
+class OtpStatus(str, Enum):
+    VALID = "valid"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    LOCKED = "locked"
+
+
+def _too_many_attempts() -> HTTPException:
+    rejected_otps.inc()
+    return HTTPException(
+        status_code=429,
+        detail="too many otp attempts, retry later",
+        headers={"Retry-After": str(settings.OTP_TTL_SECONDS)},
+    )
+
+
+class _Entry:
+    __slots__ = ("code", "expires_at", "attempts", "slot")
+
+    def __init__(self, code: str, expires_at: float, attempts: int, slot: int):
+        self.code = code
+        self.expires_at = expires_at
+        self.attempts = attempts
+        self.slot = slot
+
+
+class TimingWheelOtpStore:
+    """
+    Per-process OTP store. Entries are bucketed by expiry second on a wheel
+    that spans the TTL, so each sweep only touches the buckets the clock has
+    passed instead of scanning every entry. Failed attempts survive a resend
+    until the entry expires, and issuing is refused once `max_entries` live
+    codes are held. Only correct for a single worker.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_attempts: int,
+        max_entries: int,
+        tick: float = 1.0,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+        self.max_entries = max_entries
+        self.tick = tick
+        self._slots: List[Set[str]] = [
+            set() for _ in range(math.ceil(ttl_seconds / tick) + 2)
+        ]
+        self._entries: Dict[str, _Entry] = {}
+        self._cursor = int(time.time() / tick)
+
+    def _advance(self, now: float) -> None:
+        target = int(now / self.tick)
+        steps = min(target - self._cursor, len(self._slots))
+        for step in range(1, steps + 1):
+            slot = self._slots[(self._cursor + step) % len(self._slots)]
+            for phone_number in slot:
+                self._entries.pop(phone_number, None)
+            slot.clear()
+        self._cursor = max(self._cursor, target)
+        stored_otps.set(len(self._entries))
+
+    def _remove(self, phone_number: str) -> None:
+        entry = self._entries.pop(phone_number, None)
+        if entry is not None:
+            self._slots[entry.slot].discard(phone_number)
+
+    async def issue(self, phone_number: str, code: str) -> None:
+        now = time.time()
+        self._advance(now)
+        entry = self._entries.get(phone_number)
+        if entry is None and len(self._entries) >= self.max_entries:
+            rejected_otps.inc()
+            raise HTTPException(
+                status_code=503,
+                detail="otp service is busy, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        attempts = 0
+        if entry is not None:
+            if entry.attempts >= self.max_attempts:
+                raise _too_many_attempts()
+            attempts = entry.attempts
+            self._remove(phone_number)
+        expires_at = now + self.ttl_seconds
+        slot = math.ceil(expires_at / self.tick) % len(self._slots)
+        self._entries[phone_number] = _Entry(code, expires_at, attempts, slot)
+        self._slots[slot].add(phone_number)
+        stored_otps.set(len(self._entries))
+
+    async def verify(self, phone_number: str, code: str) -> OtpStatus:
+        now = time.time()
+        self._advance(now)
+        entry = self._entries.get(phone_number)
+        if entry is None:
+            return OtpStatus.NOT_FOUND
+        if entry.expires_at <= now:
+            self._remove(phone_number)
+            return OtpStatus.EXPIRED
+        if entry.attempts >= self.max_attempts:
+            return OtpStatus.LOCKED
+        if not hmac.compare_digest(entry.code, code):
+            entry.attempts += 1
+            return OtpStatus.INVALID
+        self._remove(phone_number)
+        stored_otps.set(len(self._entries))
+        return OtpStatus.VALID
+
+
+class PostgresOtpStore:
+    """
+    OTP store shared by every worker, kept in an UNLOGGED table so writes
+    skip the WAL. Codes are stored as an HMAC, a successful verify consumes
+    the row in the same statement that checks it, and expired rows are
+    purged at most once per `sweep_interval` through the expires_at index.
+    """
+
+    def __init__(
+        self, ttl_seconds: int, max_attempts: int, sweep_interval: float = 60.0
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+        self.sweep_interval = sweep_interval
+        self._swept_at = 0.0
+
+    @staticmethod
+    def _digest(phone_number: str, code: str) -> str:
+        return hmac.new(
+            settings.ACCESS_SECRET_TOKEN.encode(),
+            f"{phone_number}:{code}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+
+    async def sweep(self) -> int:
+        async with async_session() as db:
+            result = await db.execute(
+                delete(OtpCode).where(OtpCode.expires_at <= datetime.now(timezone.utc))
+            )
+            await db.commit()
+        self._swept_at = time.monotonic()
+        return result.rowcount
+
+    async def issue(self, phone_number: str, code: str) -> None:
+        if time.monotonic() - self._swept_at > self.sweep_interval:
+            await self.sweep()
+        now = datetime.now(timezone.utc)
+        stmt = insert(OtpCode).values(
+            phone_number=phone_number,
+            code_hash=self._digest(phone_number, code),
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+            attempts=0,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OtpCode.phone_number],
+            set_={
+                "code_hash": stmt.excluded.code_hash,
+                "expires_at": stmt.excluded.expires_at,
+                "attempts": case((OtpCode.expires_at > now, OtpCode.attempts), else_=0),
+            },
+        ).returning(OtpCode.attempts)
+        async with async_session() as db:
+            attempts = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+        if attempts >= self.max_attempts:
+            raise _too_many_attempts()
+
+    async def verify(self, phone_number: str, code: str) -> OtpStatus:
+        now = datetime.now(timezone.utc)
+        live = (
+            (OtpCode.phone_number == phone_number)
+            & (OtpCode.expires_at > now)
+            & (OtpCode.attempts < self.max_attempts)
+        )
+        async with async_session() as db:
+            consumed = await db.execute(
+                delete(OtpCode)
+                .where(live, OtpCode.code_hash == self._digest(phone_number, code))
+                .returning(OtpCode.phone_number)
+            )
+            if consumed.first() is not None:
+                await db.commit()
+                return OtpStatus.VALID
+            counted = await db.execute(
+                update(OtpCode)
+                .where(live)
+                .values(attempts=OtpCode.attempts + 1)
+                .returning(OtpCode.attempts)
+            )
+            if counted.first() is not None:
+                status = OtpStatus.INVALID
+            else:
+                row = (
+                    await db.execute(
+                        select(OtpCode.expires_at).where(
+                            OtpCode.phone_number == phone_number
+                        )
+                    )
+                ).first()
+                if row is None:
+                    status = OtpStatus.NOT_FOUND
+                elif row.expires_at <= now:
+                    status = OtpStatus.EXPIRED
+                else:
+                    status = OtpStatus.LOCKED
+            await db.commit()
+        return status
+
+
+def build_otp_store():
+    if settings.OTP_STORE_BACKEND == "memory":
+        return TimingWheelOtpStore(
+            settings.OTP_TTL_SECONDS,
+            settings.OTP_MAX_ATTEMPTS,
+            settings.OTP_MAX_ENTRIES,
+        )
+    if settings.OTP_STORE_BACKEND == "postgres":
+        return PostgresOtpStore(settings.OTP_TTL_SECONDS, settings.OTP_MAX_ATTEMPTS)
+    raise ValueError(f"unknown OTP_STORE_BACKEND: {settings.OTP_STORE_BACKEND}")
+
+
+otp_store = build_otp_store()
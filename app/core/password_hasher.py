@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Optional, Tuple
+
+import argon2
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# OWASP floor for argon2id memory; calibration never goes below it
+MIN_MEMORY_KIB = 19456
+
+HASH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+queue_wait = metrics.histogram(
+    "password_hash_queue_wait_seconds",
+    "time an argon2 job waited for a hashing thread",
+    HASH_BUCKETS,
+)
+hash_time = metrics.histogram(
+    "password_hash_seconds", "time spent inside argon2 hash/verify", HASH_BUCKETS
+)
+pending_jobs = metrics.gauge(
+    "password_hash_pending", "argon2 jobs queued or running on this worker"
+)
+rejected_jobs = metrics.counter(
+    "password_hash_rejected_total", "argon2 jobs rejected by admission control"
+)
+rehashed = metrics.counter(
+    "password_rehash_total", "stored hashes upgraded to this node's argon2 cost"
+)
+time_cost_gauge = metrics.gauge("password_hash_time_cost", "calibrated argon2 t")
+memory_cost_gauge = metrics.gauge(
+    "password_hash_memory_kib", "calibrated argon2 memory in KiB"
+)
+
+
+class PasswordHasher:
+    """
+    Runs argon2 on a small dedicated thread pool so hashing never blocks the
+    event loop. At most `max_workers` hashes run concurrently; once
+    `max_pending` jobs are queued or running, new ones are rejected with 503
+    instead of piling up behind a login storm.
+
+    `calibrate` picks the argon2 cost for this machine at startup. A stored
+    hash is only rehashed on login when its cost (t * m) falls outside
+    `rehash_tolerance` times the local cost, so nodes calibrated slightly
+    differently do not keep rewriting each other's hashes.
+    """
+
+    def __init__(
+        self, max_workers: int, max_pending: int, rehash_tolerance: float = 2.0
+    ) -> None:
+        self.context = CryptContext(schemes=["argon2"], deprecated="auto")
+        self.max_pending = max_pending
+        self.rehash_tolerance = rehash_tolerance
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="argon2"
+        )
+        self._pending = 0
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            rejected_jobs.inc()
+            raise HTTPException(
+                status_code=503,
+                detail="too many concurrent password operations, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        queued_at = perf_counter()
+
+        def timed():
+            started_at = perf_counter()
+            queue_wait.observe(started_at - queued_at)
+            try:
+                return fn(*args)
+            finally:
+                hash_time.observe(perf_counter() - started_at)
+
+        self._pending += 1
+        pending_jobs.set(self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            pending_jobs.set(self._pending)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(self.context.verify, plain, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            params = argon2.extract_parameters(hashed)
+        except argon2.exceptions.InvalidHashError:
+            return True
+        handler = self.context.handler("argon2")
+        if params.type != argon2.Type.ID or params.version != handler.max_version:
+            return True
+        ratio = (params.time_cost * params.memory_cost) / (
+            handler.default_rounds * handler.memory_cost
+        )
+        return not 1 / self.rehash_tolerance <= ratio <= self.rehash_tolerance
+
+    def _verify_and_rehash(self, plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        if not self.context.verify(plain, hashed):
+            return False, None
+        if not self.needs_rehash(hashed):
+            return True, None
+        rehashed.inc()
+        return True, self.context.hash(plain)
+
+    async def verify_and_rehash(
+        self, plain: str, hashed: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self._run(self._verify_and_rehash, plain, hashed)
+
+    def _calibrate(self, target_seconds: float, max_memory_kib: int) -> Tuple[int, int]:
+        handler = self.context.handler("argon2")
+
+        def sample(memory_kib: int) -> float:
+            hasher = handler.using(time_cost=1, memory_cost=memory_kib)
+            timings = []
+            for _ in range(3):
+                started_at = perf_counter()
+                hasher.hash("calibration")
+                timings.append(perf_counter() - started_at)
+            return min(timings)
+
+        memory_kib = max_memory_kib
+        elapsed = sample(memory_kib)
+        while elapsed > target_seconds and memory_kib // 2 >= MIN_MEMORY_KIB:
+            memory_kib //= 2
+            elapsed = sample(memory_kib)
+        time_cost = max(1, round(target_seconds / elapsed))
+        return time_cost, memory_kib
+
+    async def calibrate(self, target_seconds: float, max_memory_kib: int) -> None:
+        if target_seconds <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        time_cost, memory_kib = await loop.run_in_executor(
+            self._executor, self._calibrate, target_seconds, max_memory_kib
+        )
+        self.context.update(argon2__time_cost=time_cost, argon2__memory_cost=memory_kib)
+        time_cost_gauge.set(time_cost)
+        memory_cost_gauge.set(memory_kib)
+        logger.info(
+            f"[password-hasher] calibrated argon2 to t={time_cost} m={memory_kib}KiB "
+            f"for a {target_seconds * 1000:.0f}ms target"
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rehash_tolerance=settings.PASSWORD_HASH_REHASH_TOLERANCE,
+)
@@ -0,0 +1,118 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.user_management_models import Permission
+
+SCOPE_CLAIM = "scp"
+
+
+def permission_id_mask(permission_ids: Iterable[int]) -> int:
+    mask = 0
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+    return mask
+
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    return permission_id_mask(perm.permission_id for perm in permissions)
+
+
+def encode_mask(mask: int) -> str:
+    return format(mask, "x")
+
+
+def decode_mask(value: Optional[str]) -> int:
+    return int(value, 16) if value else 0
+
+
+@dataclass(frozen=True)
+class CompiledScopes:
+    mask: int
+    unknown: FrozenSet[str]
+
+
+class PermissionRegistry:
+    """
+    Maps permission names to bit positions. The bit of a permission is its
+    permission_id, so every worker agrees on the encoding without
+    coordination and newly created permissions never shift existing bits.
+    Required scopes are compiled to a mask once per distinct scope list.
+    """
+
+    def __init__(self, reload_interval: float = 60.0) -> None:
+        self.reload_interval = reload_interval
+        self._bits: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._compiled: Dict[Tuple[str, ...], CompiledScopes] = {}
+        self._loaded_at = 0.0
+        self._stale = True
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    async def load(self, db: Optional[AsyncSession] = None) -> None:
+        if db is None:
+            async with async_session() as session:
+                return await self.load(session)
+        result = await db.execute(
+            select(Permission.permission_id, Permission.name).filter(
+                Permission.is_deleted == False
+            )
+        )
+        rows = result.all()
+        self._bits = {name: permission_id for permission_id, name in rows}
+        self._names = {permission_id: name for permission_id, name in rows}
+        self._compiled = {}
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def mask_of_names(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            bit = self._bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def names_of(self, mask: int) -> List[str]:
+        names, bit = [], 0
+        while mask:
+            if mask & 1:
+                names.append(self._names.get(bit, f"#{bit}"))
+            mask >>= 1
+            bit += 1
+        return names
+
+    def compile(self, scopes: Sequence[str]) -> CompiledScopes:
+        key = tuple(scopes)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            unknown = frozenset(name for name in key if name not in self._bits)
+            compiled = CompiledScopes(self.mask_of_names(key), unknown)
+            self._compiled[key] = compiled
+            if unknown and time.monotonic() - self._loaded_at > self.reload_interval:
+                self._stale = True
+        return compiled
+
+    def precompile(self, routes: Iterable) -> int:
+        from app.api.dependecies.auth import get_current_user
+
+        stack = [route.dependant for route in routes if hasattr(route, "dependant")]
+        while stack:
+            dependant = stack.pop()
+            if dependant.call is get_current_user:
+                self.compile(dependant.security_scopes or [])
+            stack.extend(dependant.dependencies)
+        return len(self._compiled)
+
+
+permission_registry = PermissionRegistry()
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str], None]
+ConnectHook = Callable[[], Awaitable[None]]
+
+
+class PgListener:
+    """
+    One dedicated asyncpg connection per worker that LISTENs on a set of
+    channels and dispatches payloads to in-process handlers. Reconnects with
+    backoff; `on_connect` hooks run after every (re)connect so subscribers can
+    resync state they may have missed while disconnected.
+    """
+
+    def __init__(self, db_url: str, reconnect_delay: float = 1.0) -> None:
+        self.db_url = db_url
+        self.reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[NotificationHandler]] = {}
+        self._connect_hooks: List[ConnectHook] = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listening
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: NotificationHandler,
+        on_connect: Optional[ConnectHook] = None,
+    ) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+        if on_connect is not None:
+            self._connect_hooks.append(on_connect)
+
+    def _dsn(self) -> str:
+        url = make_url(self.db_url).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"[pg-listener] handler for {channel} failed: {e}")
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(self._dsn())
+                self._connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await self._connection.add_listener(channel, self._dispatch)
+                for hook in self._connect_hooks:
+                    await hook()
+                self._listening = True
+                delay = self.reconnect_delay
+                logger.info(f"[pg-listener] listening on {list(self._handlers)}")
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[pg-listener] connection error: {e}")
+            finally:
+                self._listening = False
+                # a failed add_listener or hook would otherwise leave this
+                # connection listening next to the retry's, and every
+                # notification would be dispatched twice
+                await self._close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None or connection.is_closed():
+            return
+        try:
+            await connection.close(timeout=5)
+        except Exception as e:
+            logger.warning(f"[pg-listener] close failed: {e}")
+            connection.terminate()
+
+    async def start(self) -> None:
+        if self._task is None and self._handlers and self.db_url:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+        self._listening = False
+
+
+async def publish(db: AsyncSession, channel: str, payload: str) -> None:
+    """NOTIFY inside the caller's transaction, so it is delivered on COMMIT."""
+    await db.execute(select(func.pg_notify(channel, payload)))
+
+
+pg_listener = PgListener(settings.DB_URL)
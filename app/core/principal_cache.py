@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.permission_registry import permission_id_mask, permission_registry
+from app.core.pg_listener import pg_listener, publish
+from app.models.user_management_models import Permission, RolePermission, User
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    is_active: bool
+    role_id: int
+    permission_mask: int
+    role_version: int = 0
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of immutable authorization snapshots keyed by user_id; the
+    permission set is held as the bitmask from `permission_registry`.
+    Role permission changes bump a per-role version stamp instead of scanning
+    the LRU; user changes evict the single entry. Both are broadcast on the
+    `principal_invalidation` channel as `role:<id>` / `user:<id>`.
+    """
+
+    CHANNEL = "principal_invalidation"
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Principal]" = OrderedDict()
+        self._role_versions: Dict[int, int] = {}
+        self._generation = 0
+
+    @property
+    def ready(self) -> bool:
+        return pg_listener.is_listening
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        principal = self._entries.get(user_id) if self.ready else None
+        if principal is None:
+            return None
+        if principal.role_version != self._role_versions.get(principal.role_id, 0):
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return principal
+
+    def put(self, principal: Principal, generation: int) -> None:
+        if generation != self._generation or not self.ready:
+            return
+        self._entries[principal.user_id] = principal
+        self._entries.move_to_end(principal.user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._generation += 1
+        self._entries.pop(user_id, None)
+
+    def invalidate_role(self, role_id: int) -> None:
+        self._generation += 1
+        self._role_versions[role_id] = self._role_versions.get(role_id, 0) + 1
+        permission_registry.mark_stale()
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        permission_registry.mark_stale()
+
+    def handle_notification(self, payload: str) -> None:
+        kind, _, key = payload.partition(":")
+        if kind == "role":
+            self.invalidate_role(int(key))
+        elif kind == "user":
+            self.invalidate_user(int(key))
+
+    async def on_connect(self) -> None:
+        self.clear()
+
+    async def publish_role_change(self, db: AsyncSession, role_id: int) -> None:
+        await publish(db, self.CHANNEL, f"role:{role_id}")
+        self.invalidate_role(role_id)
+
+    @staticmethod
+    def _principal_query(*columns):
+        # user and role permission ids in one round trip; soft-deleted grants
+        # and permissions are joined but grant nothing
+        permission_ids = func.array_agg(RolePermission.permission_id).filter(
+            RolePermission.is_deleted == False, Permission.is_deleted == False
+        )
+        return (
+            select(
+                User.user_id,
+                User.is_active,
+                User.is_deleted,
+                User.role_id,
+                permission_ids.label("permission_ids"),
+                *columns,
+            )
+            .outerjoin(RolePermission, RolePermission.role_id == User.role_id)
+            .outerjoin(
+                Permission, Permission.permission_id == RolePermission.permission_id
+            )
+            .group_by(User.user_id)
+        )
+
+    def _from_row(self, row) -> Principal:
+        return Principal(
+            user_id=row.user_id,
+            is_active=bool(row.is_active and not row.is_deleted),
+            role_id=row.role_id,
+            permission_mask=permission_id_mask(row.permission_ids or ()),
+            role_version=self._role_versions.get(row.role_id, 0),
+        )
+
+    async def load(self, db: AsyncSession, user_id: int) -> Optional[Principal]:
+        principal = self.get(user_id)
+        if principal is not None:
+            return principal
+        generation = self._generation
+        result = await db.execute(
+            self._principal_query().filter(User.user_id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        principal = self._from_row(row)
+        self.put(principal, generation)
+        return principal
+
+    async def load_credentials(
+        self, db: AsyncSession, email: str
+    ) -> Optional[Tuple[Principal, str]]:
+        generation = self._generation
+        result = await db.execute(
+            self._principal_query(User.password_hash).filter(User.email == email)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        principal = self._from_row(row)
+        self.put(principal, generation)
+        return principal, str(row.password_hash)
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE)
+pg_listener.subscribe(
+    PrincipalCache.CHANNEL,
+    principal_cache.handle_notification,
+    on_connect=principal_cache.on_connect,
+)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[attr].history.has_changes()
+        for attr in ("is_active", "is_deleted", "role_id")
+    ):
+        connection.execute(
+            select(func.pg_notify(PrincipalCache.CHANNEL, f"user:{target.user_id}"))
+        )
+        principal_cache.invalidate_user(target.user_id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    connection.execute(
+        select(func.pg_notify(PrincipalCache.CHANNEL, f"user:{target.user_id}"))
+    )
+    principal_cache.invalidate_user(target.user_id)
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.database import async_session, engine_options
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "primary_until"
+
+# 0 on a primary or a caught-up standby, replay delay in seconds otherwise
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+healthy_replicas = metrics.gauge(
+    "db_replicas_healthy", "read replicas currently passing health checks"
+)
+primary_reads = metrics.counter(
+    "db_reads_primary_total", "read sessions served by the primary"
+)
+replica_reads = metrics.counter(
+    "db_reads_replica_total", "read sessions served by a replica"
+)
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.engine = create_async_engine(url, **engine_options)
+        self.session = sessionmaker(
+            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.healthy = False
+
+
+class ReplicaRouter:
+    """
+    Hands out read sessions round-robin across healthy replicas, falling back
+    to the primary when none is healthy. A background task marks a replica
+    unhealthy when it is unreachable or replaying more than `max_lag_seconds`
+    behind. After a successful write a client is pinned to the primary for
+    `pin_seconds`, by bearer-token digest on this worker and by cookie on
+    every other worker, so it always reads its own writes.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        pin_seconds: int,
+        max_lag_seconds: float,
+        check_interval: float,
+    ) -> None:
+        self.replicas = [Replica(url) for url in urls]
+        self.pin_seconds = pin_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._cursor = itertools.count()
+        self._pins: "OrderedDict[bytes, float]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @staticmethod
+    def _pin_key(request: Request) -> Optional[bytes]:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.blake2b(authorization.encode(), digest_size=16).digest()
+
+    def pin(self, request: Request, response: Response) -> None:
+        now = time.time()
+        until = now + self.pin_seconds
+        key = self._pin_key(request)
+        if key is not None:
+            self._pins.pop(key, None)
+            self._pins[key] = until
+        # pins share one window length, so the oldest ones expire first
+        while self._pins and next(iter(self._pins.values())) <= now:
+            self._pins.popitem(last=False)
+        response.set_cookie(
+            PIN_COOKIE,
+            str(int(until) + 1),
+            max_age=self.pin_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+
+    def is_pinned(self, request: Request) -> bool:
+        now = time.time()
+        key = self._pin_key(request)
+        if key is not None and self._pins.get(key, 0) > now:
+            return True
+        try:
+            return float(request.cookies.get(PIN_COOKIE, 0)) > now
+        except ValueError:
+            return False
+
+    def session_factory(self, request: Request) -> sessionmaker:
+        if self.enabled and not self.is_pinned(request):
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if healthy:
+                replica_reads.inc()
+                return healthy[next(self._cursor) % len(healthy)].session
+        primary_reads.inc()
+        return async_session
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(REPLICA_LAG_SQL), timeout=2)
+            healthy = float(lag or 0) <= self.max_lag_seconds
+        except Exception as e:
+            logger.warning(f"[replicas] health check failed for replica : {e}")
+            healthy = False
+        if healthy != replica.healthy:
+            logger.info(
+                f"[replicas] replica {replica.engine.url.host} "
+                f"{'healthy' if healthy else 'unhealthy'}"
+            )
+        replica.healthy = healthy
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+        healthy_replicas.set(sum(replica.healthy for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DB_READ_REPLICA_URLS.split(",") if url.strip()],
+    pin_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+)
@@ -0,0 +1,63 @@
+import logging
+from pathlib import Path
+from typing import Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+# the first revision only drops a stray table; every schema in the field was
+# built by create_all from the models as they stood at this revision, and
+# the later revisions upgrade from there
+BASELINE = "a23e15d0d8f9"
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+def expected_heads() -> Set[str]:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(MIGRATIONS_DIR)).get_heads())
+
+
+async def verify_schema(engine: AsyncEngine) -> None:
+    expected = expected_heads()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            applied = set(result.scalars().all())
+    except ProgrammingError as e:
+        raise SchemaMismatchError(
+            "database has no alembic_version table. If its tables were created "
+            f"by the old create_all startup, run `alembic stamp {BASELINE}` and "
+            "then `alembic upgrade head`. An empty database has no migration "
+            "path from scratch: start once with SCHEMA_STARTUP_MODE=create_all, "
+            "then run `alembic stamp head`"
+        ) from e
+    if applied != expected:
+        raise SchemaMismatchError(
+            f"database is at revision {sorted(applied)} but the code expects "
+            f"{sorted(expected)}; run `alembic upgrade head` before starting"
+        )
+    logger.info(f"[schema] database at alembic head {sorted(applied)}")
+
+
+async def create_all(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def prepare_schema(engine: AsyncEngine, mode: str) -> None:
+    if mode == "verify":
+        await verify_schema(engine)
+    elif mode == "create_all":
+        await create_all(engine)
+    elif mode != "off":
+        raise ValueError(f"unknown SCHEMA_STARTUP_MODE: {mode}")
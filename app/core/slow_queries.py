@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+import json
+import logging
+import re
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from greenlet import getcurrent
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CALLER_MODULES = ("app.services.", "app.api.", "app.core.")
+INSTRUMENTATION_MODULES = (__name__, "app.core.sql_stats")
+MAX_STATEMENT_CHARS = 4000
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+PLAN_ONLY_PREFIX = "EXPLAIN (FORMAT JSON) "
+# ANALYZE executes the statement; these would take locks, send notifications
+# or advance sequences on the side connection, so they only get a plan
+SIDE_EFFECTS = re.compile(
+    r"\bpg_\w*advisory\w*|\bpg_notify\b|\bnextval\b|\bsetval\b"
+    r"|\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b",
+    re.IGNORECASE,
+)
+
+slow_queries_total = metrics.counter(
+    "db_slow_queries_total", "statements slower than SLOW_QUERY_THRESHOLD_MS"
+)
+explains_total = metrics.counter(
+    "db_slow_query_explains_total", "EXPLAIN plans captured for slow statements"
+)
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, never their values."""
+    if isinstance(parameters, dict):
+        return {key: parameter_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _describe(frame) -> Optional[str]:
+    module = frame.f_globals.get("__name__", "")
+    if not module.startswith(CALLER_MODULES) or module in INSTRUMENTATION_MODULES:
+        return None
+    owner = frame.f_locals.get("self")
+    if owner is None:
+        return f"{frame.f_globals['__name__']}.{frame.f_code.co_name}"
+    return f"{type(owner).__name__}.{frame.f_code.co_name}"
+
+
+def calling_method() -> Optional[str]:
+    """
+    Innermost app function on the stack. The async driver runs statements in
+    a greenlet whose stack ends at the sync execute call, so the awaiting
+    coroutines are found by continuing on the parent greenlet.
+    """
+    frame = sys._getframe(1)
+    parent = getcurrent().parent
+    while frame is not None or parent is not None:
+        if frame is None:
+            frame, parent = parent.gr_frame, None
+            continue
+        caller = _describe(frame)
+        if caller is not None:
+            return caller
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of statements slower than `threshold_ms`, with the shape of
+    their parameters and the app method that issued them. With `explain` on,
+    a slow SELECT is re-run once per statement text per `explain_cooldown`
+    under EXPLAIN (ANALYZE, BUFFERS) on a separate pooled connection, in a
+    read-only transaction, and the plan is attached to the entry when it
+    arrives. Selects with side effects (locks, notifications, sequences) are
+    planned without ANALYZE instead.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: int,
+        size: int,
+        explain: bool,
+        explain_cooldown: float = 300.0,
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.explain_cooldown = explain_cooldown
+        self._entries: deque = deque(maxlen=size)
+        self._explained_at: Dict[str, float] = {}
+        self._explain_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def observe(self, conn, statement: str, parameters, elapsed: float) -> None:
+        if not self.enabled or elapsed < self.threshold:
+            return
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        slow_queries_total.inc()
+        entry = {
+            "at": time.time(),
+            "duration_ms": round(elapsed * 1000, 2),
+            "caller": calling_method(),
+            "statement": statement[:MAX_STATEMENT_CHARS],
+            "parameters": parameter_shape(parameters),
+            "plan": None,
+        }
+        self._entries.append(entry)
+        logger.warning(
+            f"[slow-query] {entry['duration_ms']}ms in {entry['caller']}: "
+            f"{' '.join(statement.split())[:200]}"
+        )
+        if self._should_explain(statement):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            # an empty context keeps the EXPLAIN out of the request's sql stats
+            self._explain_task = contextvars.Context().run(
+                loop.create_task,
+                self._capture_plan(conn.engine, statement, parameters, entry),
+            )
+
+    def _should_explain(self, statement: str) -> bool:
+        if not self.explain or statement.lstrip()[:6].upper() != "SELECT":
+            return False
+        if self._explain_task is not None and not self._explain_task.done():
+            return False
+        now = time.monotonic()
+        if now - self._explained_at.get(statement, -self.explain_cooldown) < (
+            self.explain_cooldown
+        ):
+            return False
+        self._explained_at[statement] = now
+        if len(self._explained_at) > self._entries.maxlen:
+            self._explained_at.pop(next(iter(self._explained_at)))
+        return True
+
+    async def _capture_plan(self, sync_engine, statement, parameters, entry) -> None:
+        prefix = PLAN_ONLY_PREFIX if SIDE_EFFECTS.search(statement) else EXPLAIN_PREFIX
+        try:
+            async with AsyncEngine(sync_engine).connect() as conn:
+                try:
+                    await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    result = await conn.exec_driver_sql(prefix + statement, parameters)
+                    plan = result.scalar()
+                finally:
+                    await conn.rollback()
+                    # session-level advisory locks outlive the rollback; never
+                    # hand one back to the pool
+                    try:
+                        await conn.exec_driver_sql("SELECT pg_advisory_unlock_all()")
+                        await conn.commit()
+                    except Exception:
+                        await conn.invalidate()
+            entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+            explains_total.inc()
+        except Exception as e:
+            logger.warning(f"[slow-query] explain failed : {e}")
+
+    def entries(self) -> List[dict]:
+        return list(reversed(self._entries))
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
@@ -0,0 +1,38 @@
+from sqlalchemy import Boolean, Column, event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import with_loader_criteria
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+INCLUDE_DELETED = "include_deleted"
+
+
+class SoftDeleteMixin:
+    """
+    Marks models whose rows are tombstoned with is_deleted. Every ORM select
+    and the relationship loads it triggers skip tombstoned rows unless the
+    statement carries execution_options(include_deleted=True).
+    """
+
+    is_deleted = Column(Boolean, default=False)
+
+
+live_rows_only = with_loader_criteria(
+    SoftDeleteMixin, lambda cls: cls.is_deleted == False, include_aliases=True
+)
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _exclude_deleted(execute_state):
+    # relationship loads inherit the option from the statement that loaded
+    # their parent; refreshes must still see a row that was just deleted.
+    # Lambda statements cannot take the option and filter themselves, see
+    # app.core.statement_cache
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get(INCLUDE_DELETED, False)
+        or isinstance(execute_state.statement, StatementLambdaElement)
+    ):
+        return
+    execute_state.statement = execute_state.statement.options(live_rows_only)
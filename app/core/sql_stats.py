@@ -0,0 +1,126 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# bound parameters and expanded IN lists collapse to one placeholder
+PLACEHOLDERS = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*|%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*")
+
+statements_total = metrics.counter("db_statements_total", "statements executed")
+statement_time = metrics.histogram(
+    "db_statement_seconds", "cursor execution time per statement", DB_TIME_BUCKETS
+)
+request_statements = metrics.histogram(
+    "http_request_sql_statements", "statements executed per request", STATEMENT_BUCKETS
+)
+request_db_time = metrics.histogram(
+    "http_request_db_seconds", "db time per request, summed", DB_TIME_BUCKETS
+)
+n_plus_one_requests = metrics.counter(
+    "http_request_n_plus_one_total",
+    "requests that repeated one statement shape past the threshold",
+)
+
+
+def statement_shape(statement: str) -> str:
+    return PLACEHOLDERS.sub("?", " ".join(statement.split()))
+
+
+class RequestSqlStats:
+    __slots__ = ("statements", "db_seconds", "shapes")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+
+class RouteSqlStats:
+    """
+    Per-route totals of statements, db time and N+1 flags for this worker,
+    keyed by the route template so `/orders/{order_id}` is one row.
+    """
+
+    def __init__(self, repeat_threshold: int) -> None:
+        self.repeat_threshold = repeat_threshold
+        self._routes: Dict[str, Dict[str, float]] = {}
+        self._lock = Lock()
+
+    def record(self, route: str, stats: RequestSqlStats) -> bool:
+        shape, repeats = stats.most_repeated()
+        flagged = repeats > self.repeat_threshold
+        request_statements.observe(stats.statements)
+        request_db_time.observe(stats.db_seconds)
+        with self._lock:
+            totals = self._routes.setdefault(
+                route,
+                {"requests": 0, "statements": 0, "db_seconds": 0.0, "n_plus_one": 0},
+            )
+            totals["requests"] += 1
+            totals["statements"] += stats.statements
+            totals["db_seconds"] += stats.db_seconds
+            totals["n_plus_one"] += flagged
+        if flagged:
+            n_plus_one_requests.inc()
+            logger.warning(
+                f"[sql] possible N+1 on {route}: {repeats} x {shape[:200]} "
+                f"({stats.statements} statements in the request)"
+            )
+        return flagged
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {route: dict(totals) for route, totals in self._routes.items()}
+
+
+current_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar(
+    "current_sql_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started_at"].pop()
+    statements_total.inc()
+    statement_time.observe(elapsed)
+    slow_query_log.observe(conn, statement, parameters, elapsed)
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        stats.shapes[statement_shape(statement)] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+route_sql_stats = RouteSqlStats(settings.SQL_N_PLUS_ONE_THRESHOLD)
@@ -0,0 +1,116 @@
+from typing import Any, Callable, Dict
+
+from sqlalchemy import event, lambda_stmt, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.core.metrics import metrics
+from app.core.soft_delete import INCLUDE_DELETED
+from app.models.inventory_management_models import Medicine, MedicineBatch
+from app.models.order_management_models import Coupon, Order
+from app.models.user_management_models import User
+
+LOOKUP_OPTION = "cached_lookup"
+
+
+class CachedLookup:
+    """
+    Single-row lookup built as a lambda statement. SQLAlchemy keys the
+    lambda on its code object, so after the first call the select is neither
+    rebuilt nor re-walked for its cache key; only the bound value is new.
+    Lambda statements cannot carry the global soft-delete option, so each
+    one filters is_deleted itself; `include_deleted` reads fall back to a
+    plain select on `key`.
+    """
+
+    def __init__(self, name: str, key, build: Callable[[Any], StatementLambdaElement]):
+        self.name = name
+        self.key = key
+        self.build = build
+        self.calls = metrics.counter(
+            f"db_lookup_{name}_total", f"{name} lookups executed"
+        )
+        self.compiled_hits = metrics.counter(
+            f"db_lookup_{name}_cache_hits_total",
+            f"{name} lookups served from the compiled statement cache",
+        )
+
+    def statement(self, value: Any, include_deleted=False):
+        if include_deleted:
+            return select(self.key.class_).where(self.key == value)
+        return self.build(value)
+
+    async def __call__(self, db: AsyncSession, value: Any, include_deleted=False):
+        self.calls.inc()
+        # options go on the execute call; setting them on the lambda element
+        # would freeze its bound value at the first call's
+        result = await db.execute(
+            self.statement(value, include_deleted),
+            execution_options={
+                LOOKUP_OPTION: self.name,
+                INCLUDE_DELETED: include_deleted,
+            },
+        )
+        return result.scalar_one_or_none()
+
+
+lookups: Dict[str, CachedLookup] = {}
+
+
+def cached_lookup(key) -> Callable[[Callable], CachedLookup]:
+    def register(build: Callable[[Any], StatementLambdaElement]) -> CachedLookup:
+        lookup = CachedLookup(build.__name__, key, build)
+        lookups[lookup.name] = lookup
+        return lookup
+
+    return register
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_compiled_hit(conn, cursor, statement, parameters, context, executemany):
+    name = context.execution_options.get(LOOKUP_OPTION)
+    if name is not None and context.cache_hit == CacheStats.CACHE_HIT:
+        lookups[name].compiled_hits.inc()
+
+
+@cached_lookup(User.user_id)
+def user_by_id(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(User).where(User.user_id == user_id, User.is_deleted == False)
+    )
+
+
+@cached_lookup(Medicine.medicine_id)
+def medicine_by_id(medicine_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Medicine).where(
+            Medicine.medicine_id == medicine_id, Medicine.is_deleted == False
+        )
+    )
+
+
+@cached_lookup(Order.order_id)
+def order_by_id(order_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Order).where(
+            Order.order_id == order_id, Order.is_deleted == False
+        )
+    )
+
+
+@cached_lookup(MedicineBatch.batch_id)
+def batch_by_id(batch_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(MedicineBatch).where(
+            MedicineBatch.batch_id == batch_id, MedicineBatch.is_deleted == False
+        )
+    )
+
+
+@cached_lookup(Coupon.code)
+def coupon_by_code(code: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Coupon).where(Coupon.code == code, Coupon.is_deleted == False)
+    )
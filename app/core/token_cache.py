@@ -0,0 +1,68 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+cache_hits = metrics.counter(
+    "token_cache_hits_total", "access tokens served from cache"
+)
+cache_misses = metrics.counter(
+    "token_cache_misses_total", "access tokens verified with jwt.decode"
+)
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already verified JWT claims keyed by a digest of the raw token, so
+    a client replaying the same bearer token skips base64, HMAC and JSON work.
+    Entries are dropped at the token's `exp`. Only signature verification is
+    cached: revocation is still checked on every request by the caller.
+    """
+
+    def __init__(self, secret: str, algorithm: str, max_size: int) -> None:
+        self.secret = secret
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(key)
+                    cache_hits.inc()
+                    return entry[1]
+                del self._entries[key]
+        cache_misses.inc()
+        claims = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        expires_at = claims.get("exp")
+        if expires_at is not None:
+            with self._lock:
+                self._entries[key] = (float(expires_at), claims)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def evict(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+
+access_token_cache = VerifiedTokenCache(
+    settings.ACCESS_SECRET_TOKEN, settings.ALGORITHM, settings.TOKEN_CACHE_SIZE
+)
@@ -0,0 +1,98 @@
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.pg_listener import pg_listener, publish
+from app.models.user_management_models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class RevokedTokenCache:
+    """
+    Per-worker set of revoked access-token JTIs. Entries live only until the
+    token's own `exp`, so the set is bounded by the number of tokens revoked
+    within one access-token lifetime. Kept consistent across workers through
+    the `revoked_tokens` NOTIFY channel; while the listener is down `ready` is
+    False and callers must fall back to the database.
+    """
+
+    CHANNEL = "revoked_tokens"
+
+    def __init__(self, token_ttl_seconds: int) -> None:
+        self.token_ttl_seconds = token_ttl_seconds
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._warm = False
+
+    @property
+    def ready(self) -> bool:
+        return self._warm and pg_listener.is_listening
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def _evict(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expiry.get(jti) == expires_at:
+                del self._expiry[jti]
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        if expires_at is None:
+            expires_at = now + self.token_ttl_seconds
+        if expires_at <= now:
+            return
+        if self._expiry.get(jti, 0) >= expires_at:
+            return
+        self._expiry[jti] = expires_at
+        heapq.heappush(self._heap, (expires_at, jti))
+        self._evict(now)
+
+    def contains(self, jti: str) -> bool:
+        now = time.time()
+        self._evict(now)
+        return jti in self._expiry
+
+    def handle_notification(self, payload: str) -> None:
+        jti, _, expires_at = payload.rpartition(":")
+        self.add(jti, float(expires_at))
+
+    async def warm(self) -> None:
+        async with async_session() as db:
+            result = await db.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at).filter(
+                    RevokedToken.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            for jti, expires_at in result.all():
+                self.add(jti, expires_at.timestamp())
+        self._warm = True
+        logger.info(f"[revoked-tokens] cache warmed with {len(self)} entries")
+
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: float) -> None:
+        db.add(
+            RevokedToken(
+                jti=jti,
+                revoked_at=datetime.now(timezone.utc),
+                expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+            )
+        )
+        await publish(db, self.CHANNEL, f"{jti}:{int(expires_at)}")
+        self.add(jti, expires_at)
+
+
+revoked_tokens = RevokedTokenCache(settings.ACCESS_TOKEN_EXPIRES * 60)
+pg_listener.subscribe(
+    RevokedTokenCache.CHANNEL,
+    revoked_tokens.handle_notification,
+    on_connect=revoked_tokens.warm,
+)
@@ -1,14 +1,12 @@
 import logging
 from re import L
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
@@ -19,17 +17,23 @@ from app.api.routes import (
     file_routes,
     inventory_routes,
     issues_routes,
+    monitoring_routes,
     order_routes,
     payment_routes,
     profile_routes,
     role_routes,
 )
 from app.core.config import allowed_origins, settings
-from app.core.database import Base, engine
+from app.core.database import close_mongo, engine
+from app.core.maintenance import maintenance
+from app.core.password_hasher import password_hasher
+from app.core.permission_registry import permission_registry
+from app.core.pg_listener import pg_listener
+from app.core.read_replicas import replica_router
+from app.core.schema_check import prepare_schema
 from app.middlewares.logging_middleware import LoggingMiddleware
-from app.models.inventory_management_models import *
-from app.models.order_management_models import *
-from app.models.user_management_models import *
+from app.middlewares.read_your_writes_middleware import ReadYourWritesMiddleware
+from app.middlewares.sql_stats_middleware import SqlStatsMiddleware
 from app.services.auth_service import AuthService
 
 auth_manager = AuthService()
@@ -93,14 +97,30 @@ app.add_middleware(
 )
 app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=2)
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(SqlStatsMiddleware)
 
 
 @app.on_event("startup")
 async def startup():
-    print("Creating tables...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("Tables created!")
+    await prepare_schema(engine, settings.SCHEMA_STARTUP_MODE)
+    await password_hasher.calibrate(
+        settings.PASSWORD_HASH_TARGET_MS / 1000, settings.PASSWORD_HASH_MEMORY_KIB
+    )
+    await permission_registry.load()
+    permission_registry.precompile(app.routes)
+    await pg_listener.start()
+    await replica_router.start()
+    maintenance.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await maintenance.stop()
+    await replica_router.stop()
+    await pg_listener.stop()
+    password_hasher.shutdown()
+    close_mongo()
 
 
 @app.get("/", include_in_schema=False)
@@ -110,28 +130,16 @@ async def get_root():
 
 @app.post("/auth/admin/token", include_in_schema=False)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_postgres),
 ):
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.role).selectinload(Role.permissions))
-        .filter(User.email == form_data.username)
+    return await auth_manager.login_admin(
+        request=request,
+        email=form_data.username,
+        password=form_data.password,
+        db=db,
     )
-    user_obj = result.scalar_one_or_none()
-    if not user_obj:
-        raise HTTPException(status_code=404, detail="user not found")
-    if not auth_manager.verify_password(form_data.password, user_obj.password_hash):
-        raise HTTPException(status_code=401, detail="wrong password")
-
-    access_token = auth_manager.create_access_token(user=user_obj)
-    refresh_token = auth_manager.create_refresh_token(user=user_obj)
-
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-    }
 
 
 app.include_router(router=auth_routes.router)
@@ -143,3 +151,4 @@ app.include_router(router=order_routes.router)
 app.include_router(router=issues_routes.router)
 app.include_router(router=payment_routes.router)
 app.include_router(router=discount_routes.router)
+app.include_router(router=monitoring_routes.router)
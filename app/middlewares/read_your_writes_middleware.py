@@ -0,0 +1,19 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.read_replicas import replica_router
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response: Response = await call_next(request)
+        if (
+            replica_router.enabled
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            replica_router.pin(request, response)
+        return response
@@ -0,0 +1,27 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.sql_stats import RequestSqlStats, current_sql_stats, route_sql_stats
+
+
+class SqlStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        stats = RequestSqlStats()
+        token = current_sql_stats.set(stats)
+        try:
+            response: Response = await call_next(request)
+        finally:
+            current_sql_stats.reset(token)
+        route = request.scope.get("route")
+        path = getattr(route, "path", None)
+        if path is None:
+            return response
+        flagged = route_sql_stats.record(f"{request.method} {path}", stats)
+        if settings.DEV:
+            response.headers["X-SQL-Statements"] = str(stats.statements)
+            response.headers["X-SQL-Time-Ms"] = f"{stats.db_seconds * 1000:.1f}"
+            if flagged:
+                response.headers["X-SQL-N-Plus-One"] = "1"
+        return response
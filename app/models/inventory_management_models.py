@@ -1,8 +1,10 @@
 from sqlalchemy import (
+    DDL,
     DECIMAL,
     TIMESTAMP,
     Boolean,
     Column,
+    Computed,
     Date,
     DateTime,
     Enum,
@@ -14,16 +16,43 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from app.models.enums import PrescriptionStatusEnum
 
+# names are brands and molecules, not english words, so no stemming
+MEDICINE_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', medicine_name), 'A') || "
+    "setweight(to_tsvector('simple', generic_name), 'A') || "
+    "setweight(to_tsvector('simple', manufacturer), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')"
+)
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
-class Category(Base):
+def trigram_index(name: str, column: str) -> Index:
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    )
+
+
+class Category(SoftDeleteMixin, Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        trigram_index("ix_categories_category_name_trgm", "category_name"),
+    )
 
     category_id = Column(Integer, primary_key=True, autoincrement=True)
     category_name = Column(String(255), unique=True, nullable=False, index=True)
@@ -32,12 +61,18 @@ class Category(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
     medicines = relationship(
-        "Medicine", secondary="medicine_categories", back_populates="categories"
+        "Medicine",
+        secondary="medicine_categories",
+        primaryjoin="and_(Category.category_id == MedicineCategory.category_id, "
+        "MedicineCategory.is_deleted == false())",
+        secondaryjoin="Medicine.medicine_id == MedicineCategory.medicine_id",
+        back_populates="categories",
     )
 
 
-class Tag(Base):
+class Tag(SoftDeleteMixin, Base):
     __tablename__ = "tags"
+    __table_args__ = (trigram_index("ix_tags_name_trgm", "name"),)
 
     tag_id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), unique=True, nullable=False, index=True)
@@ -46,11 +81,16 @@ class Tag(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
     medicines = relationship(
-        "Medicine", secondary="medicine_tags", back_populates="tags"
+        "Medicine",
+        secondary="medicine_tags",
+        primaryjoin="and_(Tag.tag_id == MedicineTag.tag_id, "
+        "MedicineTag.is_deleted == false())",
+        secondaryjoin="Medicine.medicine_id == MedicineTag.medicine_id",
+        back_populates="tags",
     )
 
 
-class SideEffect(Base):
+class SideEffect(SoftDeleteMixin, Base):
     __tablename__ = "side_effects"
 
     side_effect_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -60,11 +100,16 @@ class SideEffect(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
     medicines = relationship(
-        "Medicine", secondary="medicine_side_effects", back_populates="side_effects"
+        "Medicine",
+        secondary="medicine_side_effects",
+        primaryjoin="and_(SideEffect.side_effect_id == MedicineSideEffect.side_effect_id, "
+        "MedicineSideEffect.is_deleted == false())",
+        secondaryjoin="Medicine.medicine_id == MedicineSideEffect.medicine_id",
+        back_populates="side_effects",
     )
 
 
-class Alternative(Base):
+class Alternative(SoftDeleteMixin, Base):
     __tablename__ = "alternatives"
 
     alternative_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -74,11 +119,16 @@ class Alternative(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
     medicines = relationship(
-        "Medicine", secondary="medicine_alternatives", back_populates="alternatives"
+        "Medicine",
+        secondary="medicine_alternatives",
+        primaryjoin="and_(Alternative.alternative_id == MedicineAlternative.alternative_id, "
+        "MedicineAlternative.is_deleted == false())",
+        secondaryjoin="Medicine.medicine_id == MedicineAlternative.medicine_id",
+        back_populates="alternatives",
     )
 
 
-class GSTSlab(Base):
+class GSTSlab(SoftDeleteMixin, Base):
     __tablename__ = "gst_slabs"
 
     hsn_code = Column(String(255), primary_key=True)
@@ -92,8 +142,18 @@ class GSTSlab(Base):
     medicines = relationship("Medicine", back_populates="gst_slab")
 
 
-class Medicine(Base):
+class Medicine(SoftDeleteMixin, Base):
     __tablename__ = "medicines"
+    __table_args__ = (
+        Index(
+            "ix_medicines_medicine_id_live",
+            "medicine_id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index("ix_medicines_search_vector", "search_vector", postgresql_using="gin"),
+        trigram_index("ix_medicines_medicine_name_trgm", "medicine_name"),
+        trigram_index("ix_medicines_generic_name_trgm", "generic_name"),
+    )
 
     medicine_id = Column(Integer, primary_key=True, autoincrement=True)
     medicine_name = Column(String(255), nullable=False, index=True)
@@ -115,25 +175,51 @@ class Medicine(Base):
     is_deleted = Column(Boolean, nullable=False, default=False)
     deleted_at = Column(TIMESTAMP)
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(MEDICINE_SEARCH_VECTOR, persisted=True))
+    )
 
     gst_slab = relationship("GSTSlab", back_populates="medicines")
     image = relationship("FileAsset")
 
     categories = relationship(
-        "Category", secondary="medicine_categories", back_populates="medicines"
+        "Category",
+        secondary="medicine_categories",
+        primaryjoin="and_(Medicine.medicine_id == MedicineCategory.medicine_id, "
+        "MedicineCategory.is_deleted == false())",
+        secondaryjoin="Category.category_id == MedicineCategory.category_id",
+        back_populates="medicines",
     )
 
-    tags = relationship("Tag", secondary="medicine_tags", back_populates="medicines")
+    tags = relationship(
+        "Tag",
+        secondary="medicine_tags",
+        primaryjoin="and_(Medicine.medicine_id == MedicineTag.medicine_id, "
+        "MedicineTag.is_deleted == false())",
+        secondaryjoin="Tag.tag_id == MedicineTag.tag_id",
+        back_populates="medicines",
+    )
 
     side_effects = relationship(
-        "SideEffect", secondary="medicine_side_effects", back_populates="medicines"
+        "SideEffect",
+        secondary="medicine_side_effects",
+        primaryjoin="and_(Medicine.medicine_id == MedicineSideEffect.medicine_id, "
+        "MedicineSideEffect.is_deleted == false())",
+        secondaryjoin="SideEffect.side_effect_id == MedicineSideEffect.side_effect_id",
+        back_populates="medicines",
     )
 
     alternatives = relationship(
-        "Alternative", secondary="medicine_alternatives", back_populates="medicines"
+        "Alternative",
+        secondary="medicine_alternatives",
+        primaryjoin="and_(Medicine.medicine_id == MedicineAlternative.medicine_id, "
+        "MedicineAlternative.is_deleted == false())",
+        secondaryjoin="Alternative.alternative_id == MedicineAlternative.alternative_id",
+        back_populates="medicines",
     )
 
     batches = relationship("MedicineBatch", back_populates="medicine")
+    images = relationship("MedicineImage", back_populates="medicine")
 
 
 class MedicineImage(Base):
@@ -152,7 +238,7 @@ class MedicineImage(Base):
     file_asset = relationship("FileAsset")
 
 
-class MedicineCategory(Base):
+class MedicineCategory(SoftDeleteMixin, Base):
     __tablename__ = "medicine_categories"
 
     medicine_id = Column(
@@ -170,7 +256,7 @@ class MedicineCategory(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
 
-class MedicineTag(Base):
+class MedicineTag(SoftDeleteMixin, Base):
     __tablename__ = "medicine_tags"
 
     medicine_id = Column(
@@ -186,7 +272,7 @@ class MedicineTag(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
 
-class MedicineSideEffect(Base):
+class MedicineSideEffect(SoftDeleteMixin, Base):
     __tablename__ = "medicine_side_effects"
 
     medicine_id = Column(
@@ -204,7 +290,7 @@ class MedicineSideEffect(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
 
-class MedicineAlternative(Base):
+class MedicineAlternative(SoftDeleteMixin, Base):
     __tablename__ = "medicine_alternatives"
 
     medicine_id = Column(
@@ -222,12 +308,15 @@ class MedicineAlternative(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
 
-class MedicineBatch(Base):
+class MedicineBatch(SoftDeleteMixin, Base):
     __tablename__ = "medicine_batches"
 
     batch_id = Column(Integer, primary_key=True, autoincrement=True)
     medicine_id = Column(
-        Integer, ForeignKey("medicines.medicine_id", onupdate="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("medicines.medicine_id", onupdate="CASCADE"),
+        nullable=False,
+        index=True,
     )
     batch_number = Column(String(255), nullable=False)
     expiry_date = Column(Date, nullable=False)
@@ -255,8 +344,16 @@ class FamilyMember(Base):
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
 
 
-class Prescription(Base):
+class Prescription(SoftDeleteMixin, Base):
     __tablename__ = "prescriptions"
+    __table_args__ = (
+        Index(
+            "ix_prescriptions_customer_id_uploaded_at",
+            "customer_id",
+            text("uploaded_at DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
 
     prescription_id = Column(Integer, primary_key=True, autoincrement=True)
     customer_id = Column(
@@ -279,13 +376,13 @@ class Prescription(Base):
     deleted_at = Column(TIMESTAMP)
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
-    customer = relationship("User")
+    customer = relationship("User", foreign_keys=[customer_id])
     asset = relationship("FileAsset")
     verified_user = relationship("User", foreign_keys=[verified_by])
     prescription_items = relationship("PrescriptionItem", back_populates="prescription")
 
 
-class PrescriptionItem(Base):
+class PrescriptionItem(SoftDeleteMixin, Base):
     __tablename__ = "prescription_items"
 
     pi_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -305,7 +402,7 @@ class PrescriptionItem(Base):
     medicine = relationship("Medicine")
 
 
-class Cart(Base):
+class Cart(SoftDeleteMixin, Base):
     __tablename__ = "carts"
 
     cart_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -320,11 +417,11 @@ class Cart(Base):
     deleted_at = Column(TIMESTAMP)
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
-    customer = relationship("User")
+    customer = relationship("User", foreign_keys=[customer_id])
     cart_items = relationship("CartItem", back_populates="cart")
 
 
-class CartItem(Base):
+class CartItem(SoftDeleteMixin, Base):
     __tablename__ = "cart_items"
 
     cart_item_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -5,15 +5,18 @@ from sqlalchemy import (
     Column,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from app.models.enums import (
     InvoicePaymentStatusEnum,
     IssueStatusEnum,
@@ -22,8 +25,16 @@ from app.models.enums import (
 )
 
 
-class Order(Base):
+class Order(SoftDeleteMixin, Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index(
+            "ix_orders_customer_id_created_at",
+            "customer_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
 
     order_id = Column(Integer, primary_key=True, autoincrement=True)
     customer_id = Column(
@@ -48,7 +59,7 @@ class Order(Base):
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
     # Relationships
-    customer = relationship("User")
+    customer = relationship("User", foreign_keys=[customer_id])
     member = relationship("FamilyMember")
     prescription = relationship("Prescription")
     deleted_user = relationship("User", foreign_keys=[deleted_by])
@@ -58,12 +69,15 @@ class Order(Base):
     invoice = relationship("Invoice", back_populates="order", uselist=False)
 
 
-class OrderItem(Base):
+class OrderItem(SoftDeleteMixin, Base):
     __tablename__ = "order_items"
 
     order_item_id = Column(Integer, primary_key=True, autoincrement=True)
     order_id = Column(
-        Integer, ForeignKey("orders.order_id", onupdate="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("orders.order_id", onupdate="CASCADE"),
+        nullable=False,
+        index=True,
     )
     batch_id = Column(
         Integer,
@@ -80,7 +94,7 @@ class OrderItem(Base):
     batch = relationship("MedicineBatch")
 
 
-class Payment(Base):
+class Payment(SoftDeleteMixin, Base):
     __tablename__ = "payments"
 
     payment_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -160,7 +174,7 @@ class InvoiceItem(Base):
     medicine = relationship("Medicine")
 
 
-class IssueCategory(Base):
+class IssueCategory(SoftDeleteMixin, Base):
     __tablename__ = "issue_categories"
 
     category_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -173,7 +187,7 @@ class IssueCategory(Base):
     issues = relationship("Issue", back_populates="category")
 
 
-class Issue(Base):
+class Issue(SoftDeleteMixin, Base):
     __tablename__ = "issues"
 
     issue_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -206,7 +220,7 @@ class Issue(Base):
     messages = relationship("IssueMessage", back_populates="issue")
 
 
-class IssueMessage(Base):
+class IssueMessage(SoftDeleteMixin, Base):
     __tablename__ = "issue_messages"
 
     message_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -229,7 +243,7 @@ class IssueMessage(Base):
     attachments = relationship("IssueAttachment", back_populates="message")
 
 
-class IssueAttachment(Base):
+class IssueAttachment(SoftDeleteMixin, Base):
     __tablename__ = "issue_attachments"
 
     attachment_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -251,7 +265,7 @@ class IssueAttachment(Base):
     message = relationship("IssueMessage", back_populates="attachments")
 
 
-class DiscountType(Base):
+class DiscountType(SoftDeleteMixin, Base):
     __tablename__ = "discount_types"
 
     discount_type_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -264,7 +278,7 @@ class DiscountType(Base):
     discounts = relationship("Discount", back_populates="discount_type")
 
 
-class Discount(Base):
+class Discount(SoftDeleteMixin, Base):
     __tablename__ = "discounts"
 
     discount_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -298,7 +312,7 @@ class Discount(Base):
     coupons = relationship("Coupon", back_populates="discount")
 
 
-class DiscountParameter(Base):
+class DiscountParameter(SoftDeleteMixin, Base):
     __tablename__ = "discount_parameters"
 
     parameter_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -314,7 +328,7 @@ class DiscountParameter(Base):
     discount = relationship("Discount", back_populates="parameters")
 
 
-class DiscountMedicine(Base):
+class DiscountMedicine(SoftDeleteMixin, Base):
     __tablename__ = "discount_medicines"
 
     discount_id = Column(
@@ -335,7 +349,7 @@ class DiscountMedicine(Base):
     medicine = relationship("Medicine")
 
 
-class DiscountCategory(Base):
+class DiscountCategory(SoftDeleteMixin, Base):
     __tablename__ = "discount_categories"
 
     discount_id = Column(
@@ -356,7 +370,7 @@ class DiscountCategory(Base):
     category = relationship("Category")
 
 
-class Coupon(Base):
+class Coupon(SoftDeleteMixin, Base):
     __tablename__ = "coupons"
 
     coupon_id = Column(Integer, primary_key=True, autoincrement=True)
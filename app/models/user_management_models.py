@@ -14,16 +14,18 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 from app.models.enums import ReviewStatusEnum
 
 
-class Role(Base):
+class Role(SoftDeleteMixin, Base):
     __tablename__ = "roles"
 
     role_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -36,11 +38,16 @@ class Role(Base):
     # Relationships
     users = relationship("User", back_populates="role")
     permissions = relationship(
-        "Permission", secondary="role_permissions", back_populates="roles"
+        "Permission",
+        secondary="role_permissions",
+        primaryjoin="and_(Role.role_id == RolePermission.role_id, "
+        "RolePermission.is_deleted == false())",
+        secondaryjoin="Permission.permission_id == RolePermission.permission_id",
+        back_populates="roles",
     )
 
 
-class Permission(Base):
+class Permission(SoftDeleteMixin, Base):
     __tablename__ = "permissions"
 
     permission_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -51,11 +58,16 @@ class Permission(Base):
     deleted_by = Column(Integer)
 
     roles = relationship(
-        "Role", secondary="role_permissions", back_populates="permissions"
+        "Role",
+        secondary="role_permissions",
+        primaryjoin="and_(Permission.permission_id == RolePermission.permission_id, "
+        "RolePermission.is_deleted == false())",
+        secondaryjoin="Role.role_id == RolePermission.role_id",
+        back_populates="permissions",
     )
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     __tablename__ = "users"
 
     user_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -80,7 +92,7 @@ class User(Base):
     sessions = relationship("Session", back_populates="user")
 
 
-class UserRole(Base):
+class UserRole(SoftDeleteMixin, Base):
     __tablename__ = "user_roles"
 
     user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
@@ -91,7 +103,7 @@ class UserRole(Base):
     deleted_by = Column(Integer)
 
 
-class RolePermission(Base):
+class RolePermission(SoftDeleteMixin, Base):
     __tablename__ = "role_permissions"
 
     role_id = Column(Integer, ForeignKey("roles.role_id"), primary_key=True)
@@ -109,7 +121,7 @@ class Session(Base):
 
     session_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
-    refresh_token = Column(Text, nullable=False)
+    refresh_token_hash = Column(String(64), nullable=False, unique=True, index=True)
     device_info = Column(Text, nullable=False)
     ip_address = Column(INET, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -123,11 +135,12 @@ class RevokedToken(Base):
     __tablename__ = "revoked_tokens"
 
     revoked_token_id = Column(Integer, primary_key=True, autoincrement=True)
-    jti = Column(Text, nullable=False)
+    jti = Column(Text, nullable=False, index=True)
     revoked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
 
-class FileAsset(Base):
+class FileAsset(SoftDeleteMixin, Base):
     __tablename__ = "file_assets"
 
     asset_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -142,7 +155,7 @@ class FileAsset(Base):
     deleted_by = Column(Integer)
 
 
-class ManagementProfile(Base):
+class ManagementProfile(SoftDeleteMixin, Base):
     __tablename__ = "management_profile"
 
     user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
@@ -159,7 +172,7 @@ class ManagementProfile(Base):
     profile_image = relationship("FileAsset")
 
 
-class CustomerProfile(Base):
+class CustomerProfile(SoftDeleteMixin, Base):
     __tablename__ = "customer_profile"
 
     user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
@@ -180,8 +193,15 @@ class CustomerProfile(Base):
     profile_image = relationship("FileAsset")
 
 
-class Address(Base):
+class Address(SoftDeleteMixin, Base):
     __tablename__ = "addresses"
+    __table_args__ = (
+        Index(
+            "ix_addresses_user_id",
+            "user_id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
 
     address_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -201,7 +221,7 @@ class Address(Base):
     address_type = relationship("AddressType", back_populates="addresses")
 
 
-class AddressType(Base):
+class AddressType(SoftDeleteMixin, Base):
     __tablename__ = "address_type"
 
     type_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -223,7 +243,20 @@ class PasswordReset(Base):
     used = Column(Boolean, default=False)
 
 
-class Review(Base):
+class OtpCode(Base):
+    __tablename__ = "otp_codes"
+    __table_args__ = (
+        Index("ix_otp_codes_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    phone_number = Column(String(20), primary_key=True)
+    code_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+
+
+class Review(SoftDeleteMixin, Base):
     __tablename__ = "reviews"
 
     review_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -248,5 +281,5 @@ class Review(Base):
     deleted_at = Column(TIMESTAMP)
     deleted_by = Column(Integer, ForeignKey("users.user_id", onupdate="CASCADE"))
 
-    customer = relationship("User")
+    customer = relationship("User", foreign_keys=[customer_id])
     medicine = relationship("Medicine")
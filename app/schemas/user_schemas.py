@@ -124,3 +124,7 @@ class ResetPasswordRequest(BaseModel):
     new_password: str = Field(
         ..., min_length=8, description="New password for the user"
     )
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token issued at login")
@@ -1,22 +1,30 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Tuple, Union
 
 from fastapi import Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.dependecies.auth import (
+    hash_refresh_token,
+    rotate_refresh_token,
+    scope_mask,
+)
 from app.api.dependecies.get_db_sessions import get_postgres
 from app.core.config import settings
-from app.core.database import otp_store
+from app.core.otp_store import OtpStatus, otp_store
+from app.core.password_hasher import password_hasher
+from app.core.permission_registry import SCOPE_CLAIM, encode_mask
+from app.core.principal_cache import Principal, principal_cache
+from app.core.statement_cache import user_by_id
+from app.core.token_cache import access_token_cache
+from app.core.token_revocation import revoked_tokens
 from app.models.user_management_models import (
     PasswordReset,
     RevokedToken,
-    Role,
     Session,
     User,
 )
@@ -30,34 +38,36 @@ class AuthService:
         self.ALGORITHM = settings.ALGORITHM
         self.ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRES
         self.REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRES
-        self.pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+        self.pwd_context = password_hasher.context
         self.PASSWORD_RESET_EXPIRE_MINUTES = 15
 
-    def verify_password(self, plain: str, hashed: str) -> bool:
-        return self.pwd_context.verify(plain, hashed)
+    async def verify_password(self, plain: str, hashed: str) -> bool:
+        return await password_hasher.verify(plain, hashed)
 
-    def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        return await password_hasher.hash(password)
 
-    def create_access_token(self, user: User) -> str:
+    def create_access_token(self, user: Union[User, Principal]) -> str:
         jti = str(uuid.uuid4())
         payload = {
             "sub": str(user.user_id),
-            "scopes": [perm.name for perm in user.role.permissions],
+            SCOPE_CLAIM: encode_mask(scope_mask(user)),
             "exp": datetime.utcnow()
             + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES),
             "jti": jti,
         }
         return jwt.encode(payload, self.A_SECRET_KEY, algorithm=self.ALGORITHM)
 
-    def create_refresh_token(self, user: User) -> Tuple[str, datetime]:
+    def create_refresh_token(
+        self, user: Union[User, Principal]
+    ) -> Tuple[str, datetime]:
         jti = str(uuid.uuid4())
         expiration_dt = datetime.utcnow() + timedelta(
             minutes=self.REFRESH_TOKEN_EXPIRE_DAYS
         )
         payload = {
             "sub": str(user.user_id),
-            "scopes": [perm.name for perm in user.role.permissions],
+            SCOPE_CLAIM: encode_mask(scope_mask(user)),
             "exp": expiration_dt,
             "jti": jti,
         }
@@ -68,49 +78,62 @@ class AuthService:
         result = await db.execute(select(RevokedToken).where(RevokedToken.jti == jti))
         return result.scalar_one_or_none() is not None
 
-    async def revoke_token(self, db: AsyncSession, jti: str):
+    async def revoke_token(self, db: AsyncSession, jti: str, expires_at: float):
         if not await self.is_token_revoked(db, jti):
-            db.add(RevokedToken(jti=jti))
+            await revoked_tokens.revoke(db, jti, expires_at)
             await db.commit()
 
-    async def LOGIN_ADMIN(self, request: Request, admin: AdminCreate, db: AsyncSession):
-        try:
-            result = await db.execute(
-                select(User)
-                .options(selectinload(User.role).selectinload(Role.permissions))
-                .filter(User.email == admin.email)
+    async def login_admin(
+        self, request: Request, email: str, password: str, db: AsyncSession
+    ) -> dict:
+        credentials = await principal_cache.load_credentials(db, email)
+        if credentials is None:
+            raise HTTPException(status_code=404, detail="this email doesn't exists")
+        principal, password_hash = credentials
+        is_valid, new_hash = await password_hasher.verify_and_rehash(
+            password, password_hash
+        )
+        if not is_valid:
+            raise HTTPException(status_code=401, detail="the password is wrong")
+        if not principal.is_active:
+            raise HTTPException(status_code=403, detail="this account is disabled")
+        access_token = self.create_access_token(principal)
+        refresh_token, expires_at = self.create_refresh_token(principal)
+        if new_hash is not None:
+            await db.execute(
+                update(User)
+                .where(User.user_id == principal.user_id)
+                .values(password_hash=new_hash)
             )
-            admin_obj = result.scalar_one_or_none()
-            if admin_obj is None:
-                raise HTTPException(status_code=404, detail="this email doesn't exists")
-            admin_hashed_password: str = str(admin_obj.password_hash)
-            if not self.verify_password(admin.password, admin_hashed_password):
-                raise HTTPException(status_code=401, detail="the password is wrong")
-            access_token = self.create_access_token(admin_obj)
-            refresh_token, expires_at = self.create_refresh_token(admin_obj)
-            user_agent = request.headers.get("user-agent", "unknown")
-            client_ip = request.client.host if request.client else "unknown"
-            session = Session(
-                user_id=admin_obj.user_id,
-                refresh_token=refresh_token,
-                device_info=user_agent,
-                ip_address=client_ip,
+        result = await db.execute(
+            insert(Session)
+            .values(
+                user_id=principal.user_id,
+                refresh_token_hash=hash_refresh_token(refresh_token),
+                device_info=request.headers.get("user-agent", "unknown"),
+                ip_address=request.client.host if request.client else "unknown",
                 expires_at=expires_at,
+                is_revoked=False,
             )
-            db.add(session)
-            await db.commit()
-            await db.refresh(session)
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "access_token": access_token,
-                    "refresh_token": refresh_token,
-                    "token_type": "bearer",
-                    "user_id": admin_obj.user_id,
-                    "email": admin_obj.email,
-                    "session_id": session.session_id,
-                },
+            .returning(Session.session_id)
+        )
+        session_id = result.scalar_one()
+        await db.commit()
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "user_id": principal.user_id,
+            "email": email,
+            "session_id": session_id,
+        }
+
+    async def LOGIN_ADMIN(self, request: Request, admin: AdminCreate, db: AsyncSession):
+        try:
+            content = await self.login_admin(
+                request=request, email=admin.email, password=admin.password, db=db
             )
+            return JSONResponse(status_code=200, content=content)
         except HTTPException:
             raise
         except Exception as e:
@@ -125,14 +148,12 @@ class AuthService:
     ):
         try:
             try:
-                payload = jwt.decode(
-                    token, settings.ACCESS_SECRET_TOKEN, algorithms=[settings.ALGORITHM]
-                )
+                payload = access_token_cache.decode(token)
                 jti = payload.get("jti")
             except JWTError:
                 raise HTTPException(status_code=401, detail="Invalid token")
-            revoked_entry = RevokedToken(jti=jti, revoked_at=datetime.utcnow())
-            db.add(revoked_entry)
+            await revoked_tokens.revoke(db, jti, payload["exp"])
+            access_token_cache.evict(token)
             result = await db.execute(
                 select(Session).filter(Session.session_id == session_id)
             )
@@ -155,18 +176,27 @@ class AuthService:
         self, request: Request, user_data: UserCreate, db: AsyncSession
     ):
         try:
-            if user_data.phone_number not in otp_store:
+            otp_status = await otp_store.verify(user_data.phone_number, user_data.otp)
+            if otp_status == OtpStatus.NOT_FOUND:
                 raise HTTPException(
                     status_code=404, detail="number is not found for sending otp"
                 )
-            if otp_store[user_data]["otp"] != user_data.otp:
+            if otp_status == OtpStatus.INVALID:
                 raise HTTPException(status_code=400, detail="Invalid OTP")
-            if otp_store[user_data]["expires"] < datetime.utcnow():
+            if otp_status == OtpStatus.EXPIRED:
                 raise HTTPException(status_code=400, detail="otp expired")
+            if otp_status == OtpStatus.LOCKED:
+                raise HTTPException(
+                    status_code=429, detail="too many otp attempts, retry later"
+                )
             result = await db.execute(
-                select(User).filter(User.phone_number == user_data.phone_number)
+                select(User)
+                .filter(User.phone_number == user_data.phone_number)
+                .execution_options(include_deleted=True)
             )
             user_obj = result.scalar_one_or_none()
+            if user_obj and user_obj.is_deleted:
+                raise HTTPException(status_code=403, detail="this account is disabled")
             if not user_obj:
                 new_user = User(
                     phone_number=user_data.phone_number,
@@ -183,14 +213,13 @@ class AuthService:
             client_ip = request.client.host if request.client else "unknown"
             session = Session(
                 user_id=user_obj.user_id,
-                refresh_token=refresh_token,
+                refresh_token_hash=hash_refresh_token(refresh_token),
                 device_info=user_agent,
                 ip_address=client_ip,
                 expires_at=expires_at,
             )
             db.add(session)
             await db.commit()
-            del otp_store[user_data.phone_number]
             return JSONResponse(
                 status_code=200,
                 content={
@@ -211,14 +240,12 @@ class AuthService:
     async def LOGOUT_USER(self, token: str, db: AsyncSession):
         try:
             try:
-                payload = jwt.decode(
-                    token, settings.ACCESS_SECRET_TOKEN, algorithms=[settings.ALGORITHM]
-                )
+                payload = access_token_cache.decode(token)
                 jti = payload.get("jti")
             except JWTError:
                 raise HTTPException(status_code=401, detail="Invalid token")
-            revoked_entry = RevokedToken(jti=jti, revoked_at=datetime.utcnow())
-            db.add(revoked_entry)
+            await revoked_tokens.revoke(db, jti, payload["exp"])
+            access_token_cache.evict(token)
             await db.commit()
             return JSONResponse(
                 status_code=200, content={"message": "User successfully logged out"}
@@ -231,19 +258,44 @@ class AuthService:
                 status_code=500, detail="internal server error: admin-logout"
             )
 
+    async def REFRESH_TOKEN(self, refresh_token: str, db: AsyncSession):
+        try:
+            access_token, new_refresh_token, session_id = await rotate_refresh_token(
+                refresh_token, db
+            )
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "access_token": access_token,
+                    "refresh_token": new_refresh_token,
+                    "token_type": "bearer",
+                    "session_id": session_id,
+                },
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            print(f"[refresh-token] error : {e}")
+            raise HTTPException(
+                status_code=500, detail="internal server error : [refresh_token]"
+            )
+
     async def CREATE_ADMIN(
         self, request: Request, db: AsyncSession, admin_data: AdminCreate
     ) -> User:
         try:
             result = await db.execute(
-                select(User).filter(User.email == admin_data.email)
+                select(User)
+                .filter(User.email == admin_data.email)
+                .execution_options(include_deleted=True)
             )
             admin_obj = result.scalar_one_or_none()
             if admin_obj:
                 raise HTTPException(status_code=400, detail="this email already exists")
             new_user = User(
                 email=admin_data.email,
-                password_hash=self.hash_password(admin_data.password),
+                password_hash=await self.hash_password(admin_data.password),
                 role_id=admin_data.role_id,
             )
             db.add(new_user)
@@ -310,13 +362,10 @@ class AuthService:
                 raise HTTPException(status_code=400, detail="Token already used")
             if reset_entry.expires_at < datetime.utcnow():
                 raise HTTPException(status_code=400, detail="Token expired")
-            result = await db.execute(
-                select(User).filter(User.user_id == reset_entry.user_id)
-            )
-            user = result.scalar_one_or_none()
+            user = await user_by_id(db, reset_entry.user_id)
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
-            hashed_pw = self.hash_password(new_password)
+            hashed_pw = await self.hash_password(new_password)
             user.password_hash = hashed_pw
             reset_entry.used = True
             db.add(user)
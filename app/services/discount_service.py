@@ -1,11 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.statement_cache import coupon_by_code
 from app.models.order_management_models import (
     Coupon,
     Discount,
@@ -22,24 +24,51 @@ from app.schemas.discount_schemas import (
     DiscountTypeUpdate,
     DiscountUpdate,
 )
+from app.utils.pagination import Keyset
+
+DISCOUNT_TYPE_KEYSET = Keyset(DiscountType.discount_type_id)
+DISCOUNT_KEYSET = Keyset(Discount.discount_id)
 
 
 class DiscountService:
     def __init__(self) -> None:
         pass
 
+    async def upsert_links(self, db: AsyncSession, link, column, discount_id, ids):
+        # one statement for the whole set; a tombstoned link is revived in
+        # place since the composite primary key forbids a second row
+        if not ids:
+            return
+        stmt = insert(link).values(
+            [{"discount_id": discount_id, column.key: i} for i in set(ids)]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[link.discount_id, column],
+                set_={"is_deleted": False, "deleted_at": None, "deleted_by": None},
+            )
+        )
+
     async def LIST_DISCOUNT_TYPE(
-        self, db: AsyncSession, skip: int = 0, limit: int = 10
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
             result = await db.execute(
-                select(DiscountType)
-                .filter(DiscountType.is_deleted == False)
-                .offset(skip)
-                .limit(limit)
+                DISCOUNT_TYPE_KEYSET.apply(
+                    select(DiscountType).filter(DiscountType.is_deleted == False),
+                    limit,
+                    cursor,
+                    skip,
+                )
+            )
+            discount_types, next_cursor = DISCOUNT_TYPE_KEYSET.page(
+                result.scalars().all(), limit
             )
-            discount_types = result.scalars().all()
-            return discount_types
+            return {"data": discount_types, "next_cursor": next_cursor}
         except HTTPException:
             raise
         except Exception as e:
@@ -54,9 +83,9 @@ class DiscountService:
     ):
         try:
             existing = await db.execute(
-                select(DiscountType).filter(
-                    DiscountType.type_name == discount_type_data.type_name
-                )
+                select(DiscountType)
+                .filter(DiscountType.type_name == discount_type_data.type_name)
+                .execution_options(include_deleted=True)
             )
             if existing.scalar_one_or_none():
                 raise HTTPException(
@@ -137,7 +166,12 @@ class DiscountService:
             )
 
     async def LIST_ALL_DISCOUNTS(
-        self, db: AsyncSession, skip: int, limit: int, is_active: bool | None = None
+        self,
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        is_active: bool | None = None,
+        cursor: Optional[str] = None,
     ):
         try:
             query = select(Discount).where(Discount.is_deleted == False)
@@ -151,10 +185,12 @@ class DiscountService:
                     query = query.where(
                         (Discount.end_date < now) | (Discount.start_date > now)
                     )
-            query.offset(skip).limit(limit)
+            query = DISCOUNT_KEYSET.apply(query, limit, cursor, skip)
             result = await db.execute(query)
-            discounts = result.scalars().unique().all()
-            return discounts
+            discounts, next_cursor = DISCOUNT_KEYSET.page(
+                result.scalars().unique().all(), limit
+            )
+            return {"data": discounts, "next_cursor": next_cursor}
         except HTTPException:
             raise
         except Exception as e:
@@ -260,31 +296,45 @@ class DiscountService:
             if discount_data.category_ids is not None:
                 await db.execute(
                     update(DiscountCategory)
-                    .where(DiscountCategory.discount_id == discount_id)
+                    .where(
+                        DiscountCategory.discount_id == discount_id,
+                        DiscountCategory.category_id.not_in(discount_data.category_ids),
+                        DiscountCategory.is_deleted == False,
+                    )
                     .values(
                         is_deleted=True,
                         deleted_at=datetime.utcnow(),
                         deleted_by=user_id,
                     )
                 )
-                for cat_id in discount_data.category_ids:
-                    db.add(
-                        DiscountCategory(discount_id=discount_id, category_id=cat_id)
-                    )
+                await self.upsert_links(
+                    db,
+                    DiscountCategory,
+                    DiscountCategory.category_id,
+                    discount_id,
+                    discount_data.category_ids,
+                )
             if discount_data.medicine_ids is not None:
                 await db.execute(
                     update(DiscountMedicine)
-                    .where(DiscountMedicine.discount_id == discount_id)
+                    .where(
+                        DiscountMedicine.discount_id == discount_id,
+                        DiscountMedicine.medicine_id.not_in(discount_data.medicine_ids),
+                        DiscountMedicine.is_deleted == False,
+                    )
                     .values(
                         is_deleted=True,
                         deleted_at=datetime.utcnow(),
                         deleted_by=user_id,
                     )
                 )
-                for med_id in discount_data.medicine_ids:
-                    db.add(
-                        DiscountMedicine(discount_id=discount_id, medicine_id=med_id)
-                    )
+                await self.upsert_links(
+                    db,
+                    DiscountMedicine,
+                    DiscountMedicine.medicine_id,
+                    discount_id,
+                    discount_data.medicine_ids,
+                )
             if discount_data.parameters is not None:
                 await db.execute(
                     update(DiscountParameter)
@@ -386,9 +436,9 @@ class DiscountService:
     async def DELETE_PARAMETER(self, db: AsyncSession, parameter_id: int, user_id: int):
         try:
             result = await db.execute(
-                select(DiscountParameter).where(
-                    DiscountParameter.parameter_id == parameter_id
-                )
+                select(DiscountParameter)
+                .where(DiscountParameter.parameter_id == parameter_id)
+                .execution_options(include_deleted=True)
             )
             parameter_obj = result.scalar_one_or_none()
             if not parameter_obj:
@@ -447,22 +497,13 @@ class DiscountService:
         self, discount_id: int, medicine_ids: List[int], db: AsyncSession
     ):
         try:
-            for mid in medicine_ids:
-                result = await db.execute(
-                    select(DiscountMedicine).where(
-                        DiscountMedicine.discount_id == discount_id,
-                        DiscountMedicine.medicine_id == mid,
-                    )
-                )
-                existing = result.scalars().first()
-                if existing and not existing.is_deleted:
-                    continue  # already assigned and active
-                elif existing and existing.is_deleted:
-                    existing.is_deleted = False
-                    existing.deleted_at = None
-                    existing.deleted_by = None
-                else:
-                    db.add(DiscountMedicine(discount_id=discount_id, medicine_id=mid))
+            await self.upsert_links(
+                db,
+                DiscountMedicine,
+                DiscountMedicine.medicine_id,
+                discount_id,
+                medicine_ids,
+            )
             await db.commit()
             return {"message": "Medicines assigned successfully"}
         except Exception as e:
@@ -506,22 +547,13 @@ class DiscountService:
         self, discount_id: int, category_ids: List[int], db: AsyncSession
     ):
         try:
-            for cid in category_ids:
-                result = await db.execute(
-                    select(DiscountCategory).where(
-                        DiscountCategory.discount_id == discount_id,
-                        DiscountCategory.category_id == cid,
-                    )
-                )
-                existing = result.scalars().first()
-                if existing and not existing.is_deleted:
-                    continue
-                elif existing and existing.is_deleted:
-                    existing.is_deleted = False
-                    existing.deleted_at = None
-                    existing.deleted_by = None
-                else:
-                    db.add(DiscountCategory(discount_id=discount_id, category_id=cid))
+            await self.upsert_links(
+                db,
+                DiscountCategory,
+                DiscountCategory.category_id,
+                discount_id,
+                category_ids,
+            )
             await db.commit()
             return {"message": "Categories assigned successfully"}
         except Exception as e:
@@ -563,8 +595,7 @@ class DiscountService:
 
     async def CREATE_COUPON(self, data: CouponCreate, db: AsyncSession):
         try:
-            result = await db.execute(select(Coupon).where(Coupon.code == data.code))
-            existing = result.scalars().first()
+            existing = await coupon_by_code(db, data.code, include_deleted=True)
             if existing:
                 raise HTTPException(
                     status_code=400, detail="Coupon code already exists"
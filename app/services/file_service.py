@@ -1,16 +1,16 @@
 import io
 import zipfile
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-from bson import ObjectId
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
-from motor.motor_asyncio import AsyncIOMotorGridFSBucket
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import bucket
-from app.models.user_management_models import FileAsset, User
+from app.core.statement_cache import user_by_id
+from app.models.user_management_models import FileAsset
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 
 
 class FileService:
@@ -19,14 +19,13 @@ class FileService:
 
     async def UPLOAD_SINGLE_FILE(
         self,
-        bucket: AsyncIOMotorGridFSBucket,
+        bucket: "AsyncIOMotorGridFSBucket",
         db: AsyncSession,
         file: UploadFile,
         user_id: int,
     ):
         try:
-            result = await db.execute(select(User).filter(User.user_id == user_id))
-            user_obj = result.scalar_one_or_none()
+            user_obj = await user_by_id(db, user_id)
             if not user_obj:
                 raise HTTPException(status_code=404, detail="user-id not found")
             grid_file_id = await bucket.upload_from_stream(
@@ -54,7 +53,7 @@ class FileService:
 
     async def UPLOAD_MULTIPLE_FILES(
         self,
-        bucket: AsyncIOMotorGridFSBucket,
+        bucket: "AsyncIOMotorGridFSBucket",
         files: List[UploadFile],
         db: AsyncSession,
         user_id: int,
@@ -65,8 +64,7 @@ class FileService:
                     status_code=400,
                     detail="u can upload only 5 files at a time my nigga",
                 )
-            result = await db.execute(select(User).filter(User.user_id == user_id))
-            user_obj = result.scalar_one_or_none()
+            user_obj = await user_by_id(db, user_id)
             if not user_obj:
                 raise HTTPException(status_code=404, detail="user id not found")
             data: List[Dict[str, str]] = []
@@ -101,8 +99,11 @@ class FileService:
             )
 
     async def DOWNLOAD_SINGLE_FILE(
-        self, bucket: AsyncIOMotorGridFSBucket, file_id: str
+        self, bucket: "AsyncIOMotorGridFSBucket", file_id: str
     ):
+        # bson comes with pymongo; load it with the first download
+        from bson import ObjectId
+
         try:
             grid_out = await bucket.open_download_stream(ObjectId(file_id))
             return StreamingResponse(
@@ -121,9 +122,11 @@ class FileService:
 
     async def DOWNLOAD_MULTIPLE_FILES(
         self,
-        bucket: AsyncIOMotorGridFSBucket,
+        bucket: "AsyncIOMotorGridFSBucket",
         file_ids: List[str],
     ):
+        from bson import ObjectId
+
         try:
             if not file_ids:
                 raise HTTPException(status_code=400, detail="No file IDs provided")
@@ -1,15 +1,16 @@
 import json
 from datetime import datetime
 from operator import or_
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from fastapi import File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
-from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.medicine_suggest import medicine_suggest
+from app.core.statement_cache import batch_by_id, medicine_by_id
 from app.models.inventory_management_models import (
     Alternative,
     Category,
@@ -37,19 +38,40 @@ from app.schemas.inventory_schemas import (
     TagCreate,
     TagReponse,
 )
-from app.services.file_service import FileService
+from app.utils.pagination import Keyset, estimated_count
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+    from app.services.file_service import FileService
+
+MEDICINE_KEYSET = Keyset(Medicine.medicine_id)
+BATCH_KEYSET = Keyset(MedicineBatch.batch_id)
+CATEGORY_KEYSET = Keyset(Category.category_id)
+TAG_KEYSET = Keyset(Tag.tag_id)
+SIDE_EFFECT_KEYSET = Keyset(SideEffect.side_effect_id)
+ALTERNATIVE_KEYSET = Keyset(Alternative.alternative_id)
+GST_SLAB_KEYSET = Keyset(GSTSlab.hsn_code)
 
 
 class InventoryManagementService:
     def __init__(self) -> None:
-        self.file_manager = FileService()
+        self._file_manager = None
+
+    @property
+    def file_manager(self) -> "FileService":
+        if self._file_manager is None:
+            from app.services.file_service import FileService
+
+            self._file_manager = FileService()
+        return self._file_manager
 
     async def UPLOAD_MEDICINE_IMAGE(
         self,
         db: AsyncSession,
         user_id: int,
         file: UploadFile,
-        bucket: AsyncIOMotorGridFSBucket,
+        bucket: "AsyncIOMotorGridFSBucket",
         medicine_id: int,
     ):
         result = await self.file_manager.UPLOAD_SINGLE_FILE(
@@ -122,19 +144,17 @@ class InventoryManagementService:
         tag: Optional[str] = None,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
+        search: Optional[str] = None,
     ):
         try:
-            query = (
-                select(Medicine)
-                .options(
-                    joinedload(Medicine.categories),
-                    joinedload(Medicine.tags),
-                    joinedload(Medicine.side_effects),
-                    joinedload(Medicine.alternatives),
-                    joinedload(Medicine.gst_slab),
+            if search and cursor:
+                raise HTTPException(
+                    status_code=400, detail="search results are paged with skip"
                 )
-                .where(Medicine.is_deleted == False)
-            )
+            query = select(Medicine).where(Medicine.is_deleted == False)
+            # the leading-wildcard ilike filters are served by the trigram
+            # GIN indexes
             if name:
                 query = query.where(
                     or_(
@@ -142,18 +162,64 @@ class InventoryManagementService:
                         Medicine.generic_name.ilike(f"%{name}%"),
                     )
                 )
+            # EXISTS keeps one row per medicine, where a join would repeat it
+            # once per matching category or tag
             if category:
-                query = query.join(Medicine.categories).where(
-                    Category.category_name.ilike(f"%{category}%")
+                query = query.where(
+                    Medicine.categories.any(
+                        Category.category_name.ilike(f"%{category}%")
+                    )
                 )
             if tag:
-                query = query.join(Medicine.tags).where(Tag.name.ilike(f"%{tag}%"))
-            query = query.offset(skip).limit(limit)
+                query = query.where(Medicine.tags.any(Tag.name.ilike(f"%{tag}%")))
+            if search:
+                terms = func.websearch_to_tsquery("simple", search)
+                query = query.where(
+                    or_(
+                        Medicine.search_vector.op("@@")(terms),
+                        Medicine.medicine_name.op("%>")(search),
+                        Medicine.generic_name.op("%>")(search),
+                    )
+                )
+            # the catalogue is too big to count per request; the planner's
+            # estimate is good enough for a result count in the UI
+            total = None if cursor else await estimated_count(db, query)
+            # LIMIT pages medicine rows; each collection then loads with one
+            # IN query over the page's ids. Joined collection loads would
+            # multiply into one row per category x tag x side effect x
+            # alternative combination
+            query = query.options(
+                selectinload(Medicine.categories),
+                selectinload(Medicine.tags),
+                selectinload(Medicine.side_effects),
+                selectinload(Medicine.alternatives),
+                joinedload(Medicine.gst_slab),
+            )
+            if search:
+                # full-text rank plus the closest name match, so typos and
+                # partial names still rank; relevance is no stable seek key
+                rank = func.ts_rank_cd(Medicine.search_vector, terms) + func.greatest(
+                    func.word_similarity(search, Medicine.medicine_name),
+                    func.word_similarity(search, Medicine.generic_name),
+                )
+                result = await db.execute(
+                    query.order_by(rank.desc(), Medicine.medicine_id)
+                    .offset(skip)
+                    .limit(limit)
+                )
+                return {
+                    "data": result.scalars().all(),
+                    "next_cursor": None,
+                    "estimated_total": total,
+                }
+            query = MEDICINE_KEYSET.apply(query, limit, cursor, skip)
             result = await db.execute(query)
-            medicines = result.scalars().unique().all()
-            if not medicines:
-                return []
-            return medicines
+            medicines, next_cursor = MEDICINE_KEYSET.page(result.scalars().all(), limit)
+            return {
+                "data": medicines,
+                "next_cursor": next_cursor,
+                "estimated_total": total,
+            }
         except HTTPException:
             raise
         except Exception as e:
@@ -163,12 +229,41 @@ class InventoryManagementService:
                 status_code=500, detail="internal server error : [get_medicines]"
             )
 
-    async def GET_MEDICINE_BY_ID(self, db: AsyncSession, medicine_id: int):
+    async def SUGGEST_MEDICINES(self, db: AsyncSession, q: str, limit: int = 10):
         try:
+            if medicine_suggest.ready:
+                return {"data": medicine_suggest.suggest(q, limit)}
+            # the index is still loading or the listener is reconnecting and
+            # may have missed changes; answer from the trigram-indexed columns
             result = await db.execute(
-                select(Medicine).where(Medicine.medicine_id == medicine_id)
+                select(
+                    Medicine.medicine_id,
+                    Medicine.medicine_name,
+                    Medicine.generic_name,
+                )
+                .where(
+                    Medicine.is_deleted == False,
+                    or_(
+                        Medicine.medicine_name.ilike(f"%{q}%"),
+                        Medicine.generic_name.ilike(f"%{q}%"),
+                    ),
+                )
+                .order_by(func.length(Medicine.medicine_name), Medicine.medicine_id)
+                .limit(limit)
             )
-            medicine = result.scalar_one_or_none()
+            return {"data": [dict(row._mapping) for row in result.all()]}
+        except HTTPException:
+            raise
+        except Exception as e:
+            print("---------------------")
+            print(f"[suggest_medicines] : {e}")
+            raise HTTPException(
+                status_code=500, detail="internal server error : [suggest_medicines]"
+            )
+
+    async def GET_MEDICINE_BY_ID(self, db: AsyncSession, medicine_id: int):
+        try:
+            medicine = await medicine_by_id(db, medicine_id)
             if not medicine:
                 raise HTTPException(status_code=404, detail="medicine not found")
             return medicine
@@ -255,10 +350,7 @@ class InventoryManagementService:
         self, db: AsyncSession, medicine_id: int, deleted_by: int
     ):
         try:
-            result = await db.execute(
-                select(Medicine).filter(Medicine.medicine_id == medicine_id)
-            )
-            medicine = result.scalar_one_or_none()
+            medicine = await medicine_by_id(db, medicine_id)
             if not medicine:
                 raise HTTPException(status_code=404, detail="medicine not found")
             medicine.deleted_by = deleted_by
@@ -343,15 +435,16 @@ class InventoryManagementService:
         skip: int = 0,
         limit: int = 10,
         medicine_id: int | None = None,
+        cursor: Optional[str] = None,
     ):
         try:
             query = select(MedicineBatch).where(MedicineBatch.is_deleted == False)
             if medicine_id:
                 query = query.where(MedicineBatch.medicine_id == medicine_id)
-            query.offset(skip).limit(limit)
+            query = BATCH_KEYSET.apply(query, limit, cursor, skip)
             result = await db.execute(query)
-            batches = result.scalars().all()
-            return batches
+            batches, next_cursor = BATCH_KEYSET.page(result.scalars().all(), limit)
+            return {"data": batches, "next_cursor": next_cursor}
         except HTTPException:
             raise
         except Exception as e:
@@ -366,10 +459,7 @@ class InventoryManagementService:
     ):
         try:
             medicine_id = batch_data.medicine_id
-            result = await db.execute(
-                select(Medicine).filter(Medicine.medicine_id == medicine_id)
-            )
-            medicine_obj = result.scalar_one_or_none()
+            medicine_obj = await medicine_by_id(db, medicine_id)
             if not medicine_obj:
                 raise HTTPException(status_code=404, detail="medicine_id not found")
             new_batch = MedicineBatch(
@@ -396,10 +486,7 @@ class InventoryManagementService:
 
     async def GET_BATCH_BY_ID(self, db: AsyncSession, batch_id: int):
         try:
-            result = await db.execute(
-                select(MedicineBatch).filter(MedicineBatch.batch_id == batch_id)
-            )
-            batch_obj = result.scalar_one_or_none()
+            batch_obj = await batch_by_id(db, batch_id)
             if not batch_obj:
                 raise HTTPException(status_code=404, detail="batch_id not found")
             return batch_obj
@@ -417,10 +504,7 @@ class InventoryManagementService:
         self, db: AsyncSession, batch_id: int, batch_data: MedicineBatchCreate
     ):
         try:
-            result = await db.execute(
-                select(MedicineBatch).filter(MedicineBatch.batch_id == batch_id)
-            )
-            batch_obj = result.scalar_one_or_none()
+            batch_obj = await batch_by_id(db, batch_id)
             batch_obj.medicine_id = batch_data.medicine_id
             batch_obj.batch_number = batch_data.batch_number
             batch_obj.expiry_date = batch_data.expiry_date
@@ -442,10 +526,7 @@ class InventoryManagementService:
 
     async def SOFT_DELETE_BATCH(self, db: AsyncSession, batch_id: int, deleted_by: int):
         try:
-            result = await db.execute(
-                select(MedicineBatch).filter(MedicineBatch.batch_id == batch_id)
-            )
-            batch_obj = result.scalar_one_or_none()
+            batch_obj = await batch_by_id(db, batch_id, include_deleted=True)
             if not batch_obj:
                 raise HTTPException(status_code=404, detail="batch_id not found")
             if batch_obj.is_deleted:
@@ -471,9 +552,9 @@ class InventoryManagementService:
     async def CREATE_CATEGORY(self, db: AsyncSession, category_data: CategoryCreate):
         try:
             result = await db.execute(
-                select(Category).filter(
-                    Category.category_name == category_data.category_name
-                )
+                select(Category)
+                .filter(Category.category_name == category_data.category_name)
+                .execution_options(include_deleted=True)
             )
             category_obj = result.scalar_one_or_none()
             if category_obj:
@@ -496,26 +577,32 @@ class InventoryManagementService:
             )
 
     async def GET_ALL_CATEGORIES(
-        self, db: AsyncSession, skip: int = 0, limit: int = 10
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
-            result = await db.execute(
-                select(Category)
-                .filter(Category.is_deleted == False)
-                .offset(skip)
-                .limit(limit)
-            )
-            categories_obj = result.scalars().all()
-            count_result = await db.execute(
-                select(func.count()).filter(Category.is_deleted == False)
+            categories_obj, next_cursor, total = await CATEGORY_KEYSET.fetch(
+                db,
+                select(Category).filter(Category.is_deleted == False),
+                limit,
+                cursor,
+                skip,
             )
-            total = len(count_result.scalars().all())
             data = [
                 CategoryResponse.from_orm(cat).model_dump() for cat in categories_obj
             ]
             return JSONResponse(
                 status_code=200,
-                content={"msg": {"totalCount": total, "data": data}},
+                content={
+                    "msg": {
+                        "totalCount": total,
+                        "data": data,
+                        "next_cursor": next_cursor,
+                    }
+                },
             )
         except HTTPException:
             raise
@@ -556,10 +643,12 @@ class InventoryManagementService:
                 raise HTTPException(status_code=404, detail="Category not found")
             if category_data.category_name:
                 existing = await db.execute(
-                    select(Category).filter(
+                    select(Category)
+                    .filter(
                         Category.category_name == category_data.category_name,
                         Category.category_id != category_id,
                     )
+                    .execution_options(include_deleted=True)
                 )
                 if existing.scalar_one_or_none():
                     raise HTTPException(
@@ -607,7 +696,11 @@ class InventoryManagementService:
 
     async def CREATE_TAG(self, db: AsyncSession, tag_data: TagCreate):
         try:
-            result = await db.execute(select(Tag).filter(Tag.name == tag_data.name))
+            result = await db.execute(
+                select(Tag)
+                .filter(Tag.name == tag_data.name)
+                .execution_options(include_deleted=True)
+            )
             tag_obj = result.scalar_one_or_none()
             if tag_obj:
                 raise HTTPException(
@@ -628,19 +721,23 @@ class InventoryManagementService:
                 status_code=500, detail="internal server error : [create_tag]"
             )
 
-    async def LIST_ALL_TAGS(self, db: AsyncSession, skip: int, limit: int):
+    async def LIST_ALL_TAGS(
+        self, db: AsyncSession, skip: int, limit: int, cursor: Optional[str] = None
+    ):
         try:
-            result = await db.execute(
-                select(Tag).filter(Tag.is_deleted == False).offset(skip).limit(limit)
-            )
-            tags = result.scalars().all()
-            count_result = await db.execute(
-                select(func.count()).filter(Tag.is_deleted == False)
+            tags, next_cursor, total = await TAG_KEYSET.fetch(
+                db, select(Tag).filter(Tag.is_deleted == False), limit, cursor, skip
             )
             data = [TagReponse.from_orm(tag).model_dump() for tag in tags]
-            total = count_result.scalar_one()
             return JSONResponse(
-                status_code=200, content={"msg": {"totalCount": total, "data": data}}
+                status_code=200,
+                content={
+                    "msg": {
+                        "totalCount": total,
+                        "data": data,
+                        "next_cursor": next_cursor,
+                    }
+                },
             )
         except HTTPException:
             raise
@@ -659,7 +756,9 @@ class InventoryManagementService:
                 raise HTTPException(status_code=404, detail="tag not found")
             if tag_data.name:
                 dup_result = await db.execute(
-                    select(Tag).filter(Tag.name == tag_data.name, Tag.tag_id != tag_id)
+                    select(Tag)
+                    .filter(Tag.name == tag_data.name, Tag.tag_id != tag_id)
+                    .execution_options(include_deleted=True)
                 )
                 if dup_result.scalar_one_or_none():
                     raise HTTPException(
@@ -723,9 +822,9 @@ class InventoryManagementService:
     ):
         try:
             result = await db.execute(
-                select(SideEffect).filter(
-                    SideEffect.side_effect == side_effect_data.side_effect
-                )
+                select(SideEffect)
+                .filter(SideEffect.side_effect == side_effect_data.side_effect)
+                .execution_options(include_deleted=True)
             )
             side_effect_obj = result.scalar_one_or_none()
             if side_effect_obj:
@@ -747,26 +846,32 @@ class InventoryManagementService:
                 status_code=500, detail="internal server error : [create_side_effect]"
             )
 
-    async def LIST_ALL_SIDE_EFFECTS(self, db: AsyncSession, skip: int, limit: int):
+    async def LIST_ALL_SIDE_EFFECTS(
+        self, db: AsyncSession, skip: int, limit: int, cursor: Optional[str] = None
+    ):
         try:
-            result = await db.execute(
-                select(SideEffect)
-                .filter(SideEffect.is_deleted == False)
-                .offset(skip)
-                .limit(limit)
+            side_effects, next_cursor, total = await SIDE_EFFECT_KEYSET.fetch(
+                db,
+                select(SideEffect).filter(SideEffect.is_deleted == False),
+                limit,
+                cursor,
+                skip,
             )
-            side_effects = result.scalars().all()
-            count_result = await db.execute(
-                select(func.count()).filter(SideEffect.is_deleted == False)
-            )
-            total = len(count_result.scalars().all())
             data = [
                 SideEffectResponse.from_orm(sfe).model_dump() for sfe in side_effects
             ]
             return JSONResponse(
                 status_code=200,
-                content={"msg": {"totalCount": total, "data": data}},
+                content={
+                    "msg": {
+                        "totalCount": total,
+                        "data": data,
+                        "next_cursor": next_cursor,
+                    }
+                },
             )
+        except HTTPException:
+            raise
         except Exception as e:
             print("-----------------------------")
             print(f"[list_all_side_effects] : {e}")
@@ -806,10 +911,12 @@ class InventoryManagementService:
                 raise HTTPException(status_code=404, detail="side effect not found")
             if side_effect_data.side_effect:
                 dup_result = await db.execute(
-                    select(SideEffect).filter(
+                    select(SideEffect)
+                    .filter(
                         SideEffect.side_effect == side_effect_data.side_effect,
                         SideEffect.side_effect_id != side_effect_id,
                     )
+                    .execution_options(include_deleted=True)
                 )
                 if dup_result.scalar_one_or_none():
                     raise HTTPException(
@@ -861,7 +968,9 @@ class InventoryManagementService:
     ):
         try:
             result = await db.execute(
-                select(Alternative).filter(Alternative.name == alternative_data.name)
+                select(Alternative)
+                .filter(Alternative.name == alternative_data.name)
+                .execution_options(include_deleted=True)
             )
             existing_alternative = result.scalar_one_or_none()
             if existing_alternative:
@@ -884,17 +993,27 @@ class InventoryManagementService:
             )
 
     async def LIST_ALL_ALTERNATIVES(
-        self, db: AsyncSession, skip: int = 0, limit: int = 10
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
             result = await db.execute(
-                select(Alternative)
-                .filter(Alternative.is_deleted == False)
-                .offset(skip)
-                .limit(limit)
+                ALTERNATIVE_KEYSET.apply(
+                    select(Alternative).filter(Alternative.is_deleted == False),
+                    limit,
+                    cursor,
+                    skip,
+                )
+            )
+            alternatives, next_cursor = ALTERNATIVE_KEYSET.page(
+                result.scalars().all(), limit
             )
-            alternatives = result.scalars().all()
-            return alternatives
+            return {"data": alternatives, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
             print("-----------------------------")
             print(f"[LIST_ALL_ALTERNATIVES] : {e}")
@@ -976,7 +1095,9 @@ class InventoryManagementService:
     async def CREATE_GST_SLAB(self, db: AsyncSession, gst_slab_data: GSTSlabCreate):
         try:
             result = await db.execute(
-                select(GSTSlab).filter(GSTSlab.hsn_code == gst_slab_data.hsn_code)
+                select(GSTSlab)
+                .filter(GSTSlab.hsn_code == gst_slab_data.hsn_code)
+                .execution_options(include_deleted=True)
             )
             existing_slab = result.scalar_one_or_none()
             if existing_slab:
@@ -1004,17 +1125,25 @@ class InventoryManagementService:
             )
 
     async def LIST_ALL_GST_SLABS(
-        self, db: AsyncSession, skip: int = 0, limit: int = 10
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
             result = await db.execute(
-                select(GSTSlab)
-                .filter(GSTSlab.is_deleted == False)
-                .offset(skip)
-                .limit(limit)
+                GST_SLAB_KEYSET.apply(
+                    select(GSTSlab).filter(GSTSlab.is_deleted == False),
+                    limit,
+                    cursor,
+                    skip,
+                )
             )
-            slabs = result.scalars().all()
-            return slabs
+            slabs, next_cursor = GST_SLAB_KEYSET.page(result.scalars().all(), limit)
+            return {"data": slabs, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
             print("-----------------------------")
             print(f"[LIST_ALL_GST_SLABS] : {e}")
@@ -1,39 +1,56 @@
 import json
 from datetime import datetime
 from operator import or_
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from fastapi import File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
-from motor.motor_asyncio import AsyncIOMotorGridFSBucket
-from sqlalchemy import func, or_, select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.statement_cache import batch_by_id, order_by_id, user_by_id
 from app.models.enums import OrderStatusEnum, PrescriptionStatusEnum
 from app.models.inventory_management_models import (
     FamilyMember,
-    MedicineBatch,
     Prescription,
 )
 from app.models.order_management_models import Order, OrderItem
 from app.models.user_management_models import User
 from app.schemas.order_schemas import OrderCreate, OrderItemCreate, OrderItemUpdate
-from app.services.file_service import FileService
+from app.utils.pagination import Keyset
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+    from app.services.file_service import FileService
+
+ORDER_KEYSET = Keyset(Order.created_at, Order.order_id, descending=True)
+PRESCRIPTION_KEYSET = Keyset(
+    Prescription.uploaded_at, Prescription.prescription_id, descending=True
+)
 
 
 class OrderService:
     def __init__(self) -> None:
-        self.file_manager = FileService()
+        self._file_manager = None
         self.MAX_FILE_SIZE_MB = 10
         self.ALLOWED_CONTENT_TYPES = {"image/png", "image/jpeg", "application/pdf"}
 
+    @property
+    def file_manager(self) -> "FileService":
+        if self._file_manager is None:
+            from app.services.file_service import FileService
+
+            self._file_manager = FileService()
+        return self._file_manager
+
     async def UPLOAD_PRESCRIPTION(
         self,
         file: UploadFile,
         customer_id: int,
         db: AsyncSession,
-        bucket: AsyncIOMotorGridFSBucket,
+        bucket: "AsyncIOMotorGridFSBucket",
     ):
         try:
             if file.content_type not in self.ALLOWED_CONTENT_TYPES:
@@ -71,6 +88,7 @@ class OrderService:
         customer_id: int,
         skip: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
             result = await db.execute(
@@ -81,28 +99,22 @@ class OrderService:
             user_obj = result.scalar_one_or_none()
             if not user_obj:
                 raise HTTPException(status_code=404, detail="customer_id doesn't exist")
-            total_query = select(func.count()).where(
-                Prescription.customer_id == customer_id,
-                Prescription.is_deleted == False,
-            )
-            total = (await db.execute(total_query)).scalar() or 0
-            query = (
-                select(Prescription)
-                .where(
+            prescriptions, next_cursor, total = await PRESCRIPTION_KEYSET.fetch(
+                db,
+                select(Prescription).where(
                     Prescription.customer_id == customer_id,
                     Prescription.is_deleted == False,
-                )
-                .order_by(Prescription.uploaded_at.desc())
-                .offset(skip)
-                .limit(limit)
+                ),
+                limit,
+                cursor,
+                skip,
             )
-            result = await db.execute(query)
-            prescriptions = result.scalars().unique().all()
             return {
                 "total": total,
                 "page": skip,
                 "limit": limit,
                 "prescriptions": prescriptions,
+                "next_cursor": next_cursor,
             }
         except HTTPException:
             raise
@@ -228,10 +240,7 @@ class OrderService:
             )
 
     async def CREATE_ORDER(self, db: AsyncSession, order_data: OrderCreate):
-        result = await db.execute(
-            select(User).filter(User.user_id == order_data.customer_id)
-        )
-        customer = result.scalar_one_or_none()
+        customer = await user_by_id(db, order_data.customer_id)
         if not customer:
             raise HTTPException(status_code=404, detail="Customer not found")
         if order_data.member_id:
@@ -300,10 +309,15 @@ class OrderService:
             )
 
     async def GET_CUSTOMER_ORDERS(
-        self, db: AsyncSession, customer_id: int, skip: int = 0, limit: int = 10
+        self,
+        db: AsyncSession,
+        customer_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
     ):
         try:
-            result = await db.execute(
+            query = (
                 select(Order)
                 .options(
                     selectinload(Order.order_items).selectinload(OrderItem.batch),
@@ -311,12 +325,12 @@ class OrderService:
                     selectinload(Order.payments),
                 )
                 .filter(Order.customer_id == customer_id, Order.is_deleted == False)
-                .order_by(Order.created_at.desc())
-                .offset(skip)
-                .limit(limit)
             )
-            orders = result.scalars().all()
-            return orders
+            result = await db.execute(ORDER_KEYSET.apply(query, limit, cursor, skip))
+            orders, next_cursor = ORDER_KEYSET.page(result.scalars().all(), limit)
+            return {"data": orders, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"[get_customer_orders_service]: {e}")
             raise HTTPException(
@@ -417,16 +431,10 @@ class OrderService:
         self, order_id: int, order_item: OrderItemCreate, db: AsyncSession
     ):
         try:
-            result = await db.execute(select(Order).filter(Order.order_id == order_id))
-            order_obj = result.scalar_one_or_none()
+            order_obj = await order_by_id(db, order_id)
             if not order_obj:
                 raise HTTPException(status_code=404, detail="order id not found")
-            result = await db.execute(
-                select(MedicineBatch).filter(
-                    MedicineBatch.batch_id == order_item.batch_id
-                )
-            )
-            batch_obj = result.scalar_one_or_none()
+            batch_obj = await batch_by_id(db, order_item.batch_id)
             if not batch_obj:
                 raise HTTPException(status_code=404, detail="batch id not found")
             new_order_item = OrderItem(
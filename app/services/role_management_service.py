@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import HTTPException
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal_cache import principal_cache
 from app.models.user_management_models import Permission, Role, RolePermission
 from app.schemas.user_schemas import RoleCreate
 
@@ -15,7 +16,11 @@ class RoleManagementService:
 
     async def CREATE_ROLE(self, db: AsyncSession, role_data: RoleCreate) -> Role:
         try:
-            result = await db.execute(select(Role).filter(Role.name == role_data.name))
+            result = await db.execute(
+                select(Role)
+                .filter(Role.name == role_data.name)
+                .execution_options(include_deleted=True)
+            )
             existing_role = result.scalar_one_or_none()
             if existing_role:
                 raise HTTPException(
@@ -23,23 +28,29 @@ class RoleManagementService:
                 )
             role = Role(name=role_data.name, description=role_data.description)
             db.add(role)
-            await db.commit()
-            await db.refresh(role)
-            role_permissions: List[RolePermission] = []
-            new_permissions: List[Permission] = []
-            for perm_name in role_data.permissions:
-                result = await db.execute(
-                    select(Permission).filter(Permission.name == perm_name)
-                )
-                perm = result.scalar_one_or_none()
-                if not perm:
-                    perm = Permission(name=perm_name, description=f"Scope: {perm_name}")
-                    db.add(perm)
-                    await db.flush()
-                role_perm_link = RolePermission(
-                    role_id=role.role_id, permission_id=perm.permission_id
-                )
-                db.add(role_perm_link)
+            permission_names = set(role_data.permissions or [])
+            existing_perms_result = await db.execute(
+                select(Permission)
+                .filter(Permission.name.in_(permission_names))
+                .execution_options(include_deleted=True)
+            )
+            existing_permissions = existing_perms_result.scalars().all()
+            for permission in existing_permissions:
+                permission.is_deleted = False
+            existing_perm_names = {str(p.name) for p in existing_permissions}
+            new_perms_to_add = [
+                Permission(name=p, description=f"Scope: {p}")
+                for p in permission_names - existing_perm_names
+            ]
+            db.add_all(new_perms_to_add)
+            await db.flush()
+            db.add_all(
+                [
+                    RolePermission(role_id=role.role_id, permission_id=p.permission_id)
+                    for p in existing_permissions + new_perms_to_add
+                ]
+            )
+            await principal_cache.publish_role_change(db, role.role_id)
             await db.commit()
             await db.refresh(role)
             return role
@@ -98,9 +109,13 @@ class RoleManagementService:
             current_permissions = result.scalars().all()
             new_permission_names = set(role_data.permissions or [])
             existing_perms_result = await db.execute(
-                select(Permission).filter(Permission.name.in_(new_permission_names))
+                select(Permission)
+                .filter(Permission.name.in_(new_permission_names))
+                .execution_options(include_deleted=True)
             )
             existing_permissions = existing_perms_result.scalars().all()
+            for permission in existing_permissions:
+                permission.is_deleted = False
             existing_perm_names = {str(p.name) for p in existing_permissions}
             new_perms_to_add = [
                 Permission(name=p, description=f"Scope: {p}")
@@ -118,6 +133,7 @@ class RoleManagementService:
                     for p in all_permissions
                 ]
             )
+            await principal_cache.publish_role_change(db, role_id)
             await db.commit()
             await db.refresh(role)
             return role
@@ -0,0 +1,165 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Integer,
+    Select,
+    SmallInteger,
+    String,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return values
+
+
+INTEGER_RANGES = [
+    (SmallInteger, 2**15),
+    (BigInteger, 2**63),
+    (Integer, 2**31),
+]
+
+
+def fits(type_, value: Any) -> bool:
+    """Whether `value` binds to a column of `type_` without a driver error."""
+    # bool is an int subclass, but not a valid key value
+    if isinstance(value, bool) or not isinstance(value, type_.python_type):
+        return False
+    if isinstance(type_, Integer):
+        bound = next(b for t, b in INTEGER_RANGES if isinstance(type_, t))
+        return -bound <= value < bound
+    if isinstance(type_, DateTime):
+        return (value.tzinfo is not None) == bool(type_.timezone)
+    if isinstance(type_, String) and type_.length is not None:
+        return len(value) <= type_.length
+    return True
+
+
+class Keyset:
+    """
+    Stable sort key of a list endpoint. Pages after the first resume from
+    the last row's key instead of an OFFSET, so any page costs one index
+    range scan. The last column must be unique (normally the primary key)
+    and all columns share one direction so a row comparison can seek.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self):
+        if self.descending:
+            return [c.desc() for c in self.columns]
+        return list(self.columns)
+
+    def values(self, cursor: str) -> list:
+        values = decode_cursor(cursor)
+        if len(values) != len(self.columns):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        try:
+            values = [
+                datetime.fromisoformat(v) if isinstance(c.type, DateTime) else v
+                for c, v in zip(self.columns, values)
+            ]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        # a tampered cursor must not reach the driver as a value it rejects
+        if not all(fits(c.type, v) for c, v in zip(self.columns, values)):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        return [literal(v, c.type) for c, v in zip(self.columns, values)]
+
+    def apply(
+        self, query: Select, limit: int, cursor: Optional[str] = None, skip: int = 0
+    ) -> Select:
+        # one extra row tells whether a next page exists
+        query = query.order_by(None).order_by(*self.order_by()).limit(limit + 1)
+        if cursor:
+            key, after = tuple_(*self.columns), tuple_(*self.values(cursor))
+            return query.where(key < after if self.descending else key > after)
+        return query.offset(skip)
+
+    def page(self, rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1]
+        return rows[:limit], encode_cursor([getattr(last, c.key) for c in self.columns])
+
+    async def fetch(
+        self,
+        db: AsyncSession,
+        query: Select,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+    ) -> Tuple[List[Any], Optional[str], Optional[int]]:
+        """
+        One page with its total in a single round-trip: count(*) over () is
+        evaluated after WHERE and before OFFSET/LIMIT, so it rides along on every
+        row. A cursor page's window only sees the rows from the cursor on,
+        so its total is None; the first page already reported it.
+        """
+        result = await db.execute(
+            self.apply(
+                query.add_columns(func.count().over().label("total_count")),
+                limit,
+                cursor,
+                skip,
+            )
+        )
+        rows = result.unique().all()
+        items, next_cursor = self.page([row[0] for row in rows], limit)
+        if cursor:
+            return items, next_cursor, None
+        if rows:
+            return items, next_cursor, rows[0].total_count
+        if not skip:
+            return items, next_cursor, 0
+        # past the end there is no row to carry the window value
+        total = await db.scalar(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
+        return items, next_cursor, total
+
+
+async def estimated_count(db: AsyncSession, query: Select) -> int:
+    """
+    Planner's row estimate for `query`, from EXPLAIN without ANALYZE. Costs a
+    planning pass instead of a scan; accuracy follows the table statistics
+    that autovacuum keeps current.
+    """
+    conn = await db.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = plan.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,114 @@
+"""
+Counts database round-trips per admin login, legacy path vs the fused
+pipeline in AuthService.login_admin.
+
+    python -m benchmarks.admin_login_roundtrips <admin-email> <password> [runs]
+
+Needs the database from DB_URL with an existing admin account. Every BEGIN,
+statement, COMMIT and ROLLBACK sent on the engine counts as one round-trip.
+Each run inserts a session row for the admin.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from time import perf_counter
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import selectinload
+from starlette.requests import Request
+
+from app.api.dependecies.auth import hash_refresh_token
+from app.core.database import async_session, engine
+from app.core.password_hasher import password_hasher
+from app.models.user_management_models import Role, Session, User
+from app.services.auth_service import AuthService
+
+auth = AuthService()
+round_trips = Counter()
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _statement(conn, cursor, statement, parameters, context, executemany):
+    round_trips[statement.split(None, 1)[0].upper()] += 1
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _begin(conn):
+    round_trips["BEGIN"] += 1
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _commit(conn):
+    round_trips["COMMIT"] += 1
+
+
+@event.listens_for(engine.sync_engine, "rollback")
+def _rollback(conn):
+    round_trips["ROLLBACK"] += 1
+
+
+def fake_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"user-agent", b"benchmark")],
+            "client": ("127.0.0.1", 0),
+        }
+    )
+
+
+async def legacy_login(email: str, password: str) -> None:
+    # the pre-pipeline LOGIN_ADMIN: selectinload chain, ORM insert, refresh
+    async with async_session() as db:
+        result = await db.execute(
+            select(User)
+            .options(selectinload(User.role).selectinload(Role.permissions))
+            .filter(User.email == email)
+        )
+        admin_obj = result.scalar_one()
+        assert await password_hasher.verify(password, admin_obj.password_hash)
+        refresh_token, expires_at = auth.create_refresh_token(admin_obj)
+        auth.create_access_token(admin_obj)
+        session = Session(
+            user_id=admin_obj.user_id,
+            refresh_token_hash=hash_refresh_token(refresh_token),
+            device_info="benchmark",
+            ip_address="127.0.0.1",
+            expires_at=expires_at,
+        )
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+
+
+async def pipeline_login(email: str, password: str) -> None:
+    async with async_session() as db:
+        await auth.login_admin(fake_request(), email, password, db)
+
+
+async def measure(name: str, login, email: str, password: str, runs: int) -> None:
+    await login(email, password)
+    round_trips.clear()
+    started_at = perf_counter()
+    for _ in range(runs):
+        await login(email, password)
+    elapsed = perf_counter() - started_at
+    per_login = {key: count / runs for key, count in sorted(round_trips.items())}
+    print(
+        f"{name:<9} {sum(round_trips.values()) / runs:5.1f} round-trips/login "
+        f"{elapsed / runs * 1000:7.1f} ms/login  {per_login}"
+    )
+
+
+async def main() -> None:
+    email, password = sys.argv[1], sys.argv[2]
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    await measure("legacy", legacy_login, email, password, runs)
+    await measure("pipeline", pipeline_login, email, password, runs)
+    await engine.dispose()
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
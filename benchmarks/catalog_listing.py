@@ -0,0 +1,180 @@
+"""
+Medicine listing over a seeded catalogue, the legacy four-collection
+joinedload query vs InventoryManagementService.GET_MEDICINES.
+
+    python -m benchmarks.catalog_listing [medicines] [runs]
+
+Needs the database from DB_URL migrated to head. Seeds `medicines` rows
+(default 100000) with 1-3 categories, 2-8 tags, 0-6 side effects and 0-4
+alternatives each, drawn from fixed pools. That is about 60 joined rows per
+medicine for the legacy query. Everything runs in one transaction that is
+rolled back at the end.
+
+Each path is timed on the first page, on the first page with a tag filter,
+and at an offset halfway through the catalogue. The current path is also
+timed with a cursor at that depth. "medicines" is the page size that came
+back. With the tag filter, the legacy join repeats a medicine once per
+matching tag before LIMIT, so its pages come back short.
+"""
+
+import asyncio
+import sys
+from time import perf_counter
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.database import engine
+from app.core.sql_stats import RequestSqlStats, current_sql_stats
+from app.models.inventory_management_models import Medicine, Tag
+from app.services.inventory_service import InventoryManagementService
+from app.utils.pagination import encode_cursor
+
+PAGE = 20
+HSN = "bench-3004"
+
+inventory = InventoryManagementService()
+
+# pool table, id column, name column, size
+POOLS = [
+    ("categories", "category_id", "category_name", 60),
+    ("tags", "tag_id", "name", 400),
+    ("side_effects", "side_effect_id", "side_effect", 250),
+    ("alternatives", "alternative_id", "name", 800),
+]
+# link table, fan-out range, in POOLS order
+LINKS = [
+    ("medicine_categories", 1, 3),
+    ("medicine_tags", 2, 8),
+    ("medicine_side_effects", 0, 6),
+    ("medicine_alternatives", 0, 4),
+]
+
+
+async def seed(conn, medicines: int) -> None:
+    await conn.execute(
+        text(
+            "INSERT INTO gst_slabs (hsn_code, description, gst_rate, effective_from,"
+            " is_deleted) VALUES (:hsn, 'catalog benchmark', 12, CURRENT_DATE, false)"
+        ),
+        {"hsn": HSN},
+    )
+    for table, _, name, size in POOLS:
+        await conn.execute(
+            text(
+                f"INSERT INTO {table} ({name}, is_deleted) "
+                f"SELECT 'bench-{table}-' || g, false FROM generate_series(1, {size}) g"
+            )
+        )
+    await conn.execute(
+        text(
+            "INSERT INTO medicines (medicine_name, generic_name, manufacturer,"
+            " description, is_prescribed, weight, hsn_code, is_deleted) "
+            "SELECT 'bench-medicine-' || g, 'bench-generic-' || g % 5000,"
+            " 'bench-labs', 'seeded by benchmarks.catalog_listing', g % 7 = 0,"
+            " 0.5, :hsn, false FROM generate_series(1, :n) g"
+        ),
+        {"hsn": HSN, "n": medicines},
+    )
+    # deterministic spread: medicine m takes fan-out(m) pool members at
+    # stride-spaced positions, so links are distinct without random sorts
+    for (pool, column, name, _), (link, low, high) in zip(POOLS, LINKS):
+        await conn.execute(
+            text(
+                f"WITH pool AS (SELECT array_agg({column} ORDER BY {column}) AS ids "
+                f"FROM {pool} WHERE {name} LIKE 'bench-%') "
+                f"INSERT INTO {link} (medicine_id, {column}, is_deleted) "
+                f"SELECT m.medicine_id, pool.ids[1 + (m.medicine_id::bigint * 7919"
+                f" + i * 104729) % cardinality(pool.ids)], false "
+                f"FROM medicines m CROSS JOIN pool "
+                f"CROSS JOIN LATERAL generate_series(1, {low} + m.medicine_id * 31"
+                f" % {high - low + 1}) i "
+                f"WHERE m.hsn_code = :hsn ON CONFLICT DO NOTHING"
+            ),
+            {"hsn": HSN},
+        )
+    await conn.execute(text("ANALYZE"))
+
+
+async def legacy_page(db: AsyncSession, tag, skip: int):
+    query = (
+        select(Medicine)
+        .options(
+            joinedload(Medicine.categories),
+            joinedload(Medicine.tags),
+            joinedload(Medicine.side_effects),
+            joinedload(Medicine.alternatives),
+            joinedload(Medicine.gst_slab),
+        )
+        .where(Medicine.is_deleted == False)
+    )
+    if tag:
+        query = query.join(Medicine.tags).where(Tag.name.ilike(f"%{tag}%"))
+    result = await db.execute(query.offset(skip).limit(PAGE))
+    return result.scalars().unique().all()
+
+
+async def current_page(db: AsyncSession, tag, skip: int, cursor=None):
+    result = await inventory.GET_MEDICINES(
+        db=db, tag=tag, skip=skip, limit=PAGE, cursor=cursor
+    )
+    return result["data"]
+
+
+async def measure(db: AsyncSession, label: str, page, runs: int) -> None:
+    await page()
+    stats = RequestSqlStats()
+    token = current_sql_stats.set(stats)
+    try:
+        started_at = perf_counter()
+        for _ in range(runs):
+            db.expunge_all()
+            rows = await page()
+        elapsed = perf_counter() - started_at
+    finally:
+        current_sql_stats.reset(token)
+    print(
+        f"{label:<34} {elapsed / runs * 1000:9.1f} {stats.statements / runs:11.1f} "
+        f"{len(rows):10}"
+    )
+
+
+async def main() -> None:
+    medicines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        started_at = perf_counter()
+        await seed(conn, medicines)
+        print(f"seeded {medicines} medicines in {perf_counter() - started_at:.1f}s")
+        db = AsyncSession(bind=conn)
+        deep = medicines // 2
+        after = await db.scalar(
+            select(Medicine.medicine_id)
+            .where(Medicine.is_deleted == False)
+            .order_by(Medicine.medicine_id)
+            .offset(deep - 1)
+            .limit(1)
+        )
+        tag = "bench-tags-7"
+        print(f"{'page':<34} {'ms':>9} {'statements':>11} {'medicines':>10}")
+        for name, page in (("legacy", legacy_page), ("current", current_page)):
+            await measure(db, f"{name} first", lambda: page(db, None, 0), runs)
+            await measure(db, f"{name} first, tag", lambda: page(db, tag, 0), runs)
+            await measure(
+                db, f"{name} offset {deep}", lambda: page(db, None, deep), runs
+            )
+        await measure(
+            db,
+            f"current cursor at {deep}",
+            lambda: current_page(db, None, 0, encode_cursor([after])),
+            runs,
+        )
+        await db.close()
+        await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Asserts that the service queries behind the soft-delete, foreign-key and
+search indexes are planned as index scans on the expected index.
+
+    python -m benchmarks.index_usage [--natural]
+
+Needs the database from DB_URL migrated to head. By default each EXPLAIN
+runs with enable_seqscan off, so a near-empty dev database still proves
+the index matches the query's predicate and ordering. --natural leaves the
+planner alone, which is meaningful on production-sized data. Exits 1 when
+any query misses its index.
+"""
+
+import asyncio
+import json
+import sys
+
+from sqlalchemy import func, select, text
+
+from app.core.database import engine
+from app.models.inventory_management_models import (
+    Medicine,
+    MedicineBatch,
+    Prescription,
+    Tag,
+)
+from app.models.order_management_models import Coupon, Order, OrderItem
+from app.models.user_management_models import Address, RevokedToken
+
+CASES = [
+    (
+        "customer order history",
+        select(Order)
+        .where(Order.customer_id == 1, Order.is_deleted == False)
+        .order_by(Order.created_at.desc())
+        .limit(20),
+        "ix_orders_customer_id_created_at",
+    ),
+    (
+        "order items of an order",
+        select(OrderItem).where(OrderItem.order_id == 1),
+        "ix_order_items_order_id",
+    ),
+    (
+        "batches of a medicine",
+        select(MedicineBatch).where(
+            MedicineBatch.medicine_id == 1, MedicineBatch.is_deleted == False
+        ),
+        "ix_medicine_batches_medicine_id",
+    ),
+    (
+        "customer prescriptions",
+        select(Prescription)
+        .where(Prescription.customer_id == 1, Prescription.is_deleted == False)
+        .order_by(Prescription.uploaded_at.desc()),
+        "ix_prescriptions_customer_id_uploaded_at",
+    ),
+    (
+        "customer addresses",
+        select(Address).where(Address.user_id == 1, Address.is_deleted == False),
+        "ix_addresses_user_id",
+    ),
+    (
+        "live medicines page",
+        select(Medicine)
+        .where(Medicine.is_deleted == False)
+        .order_by(Medicine.medicine_id)
+        .limit(20),
+        "ix_medicines_medicine_id_live",
+    ),
+    (
+        "medicine name substring",
+        select(Medicine).where(Medicine.medicine_name.ilike("%cetam%")),
+        "ix_medicines_medicine_name_trgm",
+    ),
+    (
+        "medicine full-text search",
+        select(Medicine).where(
+            Medicine.search_vector.op("@@")(
+                func.websearch_to_tsquery("simple", "paracetamol")
+            )
+        ),
+        "ix_medicines_search_vector",
+    ),
+    (
+        "tag name substring",
+        select(Tag).where(Tag.name.ilike("%pain%")),
+        "ix_tags_name_trgm",
+    ),
+    (
+        "revoked jti",
+        select(RevokedToken).where(RevokedToken.jti == "jti"),
+        "ix_revoked_tokens_jti",
+    ),
+    (
+        "coupon by code",
+        select(Coupon).where(Coupon.code == "CODE", Coupon.is_deleted == False),
+        "coupons_code_key",
+    ),
+]
+
+
+async def explain(conn, query) -> dict:
+    # bound parameters, typed as the services send them (the search config is
+    # a REGCONFIG bind), rather than a literal rendering of the statement
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = plan.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+async def main() -> None:
+    natural = "--natural" in sys.argv[1:]
+    failures = 0
+    async with engine.connect() as conn:
+        if not natural:
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        for label, query, expected in CASES:
+            used = index_names(await explain(conn, query))
+            ok = expected in used
+            failures += not ok
+            print(
+                f"{'ok  ' if ok else 'MISS'} {label:<26} expected {expected}, "
+                f"plan uses {', '.join(sorted(used)) or 'no index'}"
+            )
+        await conn.rollback()
+    await engine.dispose()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
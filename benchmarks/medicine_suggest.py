@@ -0,0 +1,81 @@
+"""
+Per-keystroke cost of the in-memory medicine autocomplete in
+app.core.medicine_suggest.
+
+    python -m benchmarks.medicine_suggest [medicines] [iterations]
+
+Runs offline; no database is needed. Indexes a synthetic catalogue (default
+100000 medicines) of "<brand> <strength> mg" names with a generic name each,
+then times suggest() as a user types one brand name out letter by letter,
+a later word of a name ("500 mg"), and a misspelling that only the trigram
+pass can answer. Short prefixes stop after MAX_CANDIDATES prefix rows; a
+prefix that matches fewer than `limit` medicines also pays for the fuzzy
+pass. "update" is one rename applied as a notification would.
+"""
+
+import random
+import string
+import sys
+from time import perf_counter
+
+from app.core.medicine_suggest import MedicineSuggestIndex
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def build(medicines: int) -> MedicineSuggestIndex:
+    rng = random.Random(7)
+    rows = [
+        (medicine_id, f"{word(rng)} {rng.choice((5, 10, 250, 500))} mg", word(rng))
+        for medicine_id in range(1, medicines + 1)
+    ]
+    index = MedicineSuggestIndex()
+    # the same build rebuild() does, minus the database stream
+    keys = []
+    for row in rows:
+        keys.extend(index._add(*row))
+    keys.sort()
+    index._keys = keys
+    return index
+
+
+def per_call_us(call, iterations: int) -> float:
+    call()
+    started_at = perf_counter()
+    for _ in range(iterations):
+        call()
+    return (perf_counter() - started_at) / iterations * 1e6
+
+
+def main() -> None:
+    medicines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    started_at = perf_counter()
+    index = build(medicines)
+    print(
+        f"indexed {len(index)} medicines, {len(index._keys)} prefix keys, "
+        f"{len(index._trigrams)} trigrams in {perf_counter() - started_at:.1f}s"
+    )
+
+    brand = index._entries[medicines // 2][0].split(" ")[0]
+    queries = [brand[:n] for n in range(1, len(brand) + 1)]
+    queries += ["500 mg", brand[:2] + brand[3:]]
+    print(f"{'query':<16} {'us':>10} {'results':>8}")
+    for query in queries:
+        us = per_call_us(lambda: index.suggest(query, 10), iterations)
+        print(f"{query!r:<16} {us:>10.1f} {len(index.suggest(query, 10)):>8}")
+
+    name, generic = index._entries[1]
+    renamed = (f"{name} forte", generic)
+    us = per_call_us(
+        lambda: index.upsert(1, *renamed) or index.upsert(1, name, generic),
+        iterations // 10,
+    )
+    print(f"{'update':<16} {us / 2:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Cold-start cost of the API: per-module import time and time to first
+request, each measured in a fresh interpreter.
+
+    python -m benchmarks.startup_time [runs] [top-n]
+
+The first request goes to GET / through an in-process ASGI transport without
+running startup hooks, so no database or Mongo server is needed; the
+settings must still be importable (.env or environment).
+
+It also lists the Mongo driver modules (bson, pymongo, motor, gridfs) that
+importing app.main loads. There should be none: the Mongo client, the GridFS
+bucket and FileService are all built on first use, and bson is imported by
+the download handlers that parse ObjectIds.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MONGO_PACKAGES = ("bson", "pymongo", "motor", "gridfs")
+
+FIRST_REQUEST = """
+import asyncio, json, time
+started_at = time.perf_counter()
+import app.main
+imported_at = time.perf_counter()
+import httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        response = await client.get("/")
+        response.raise_for_status()
+
+asyncio.run(first_request())
+print(json.dumps({
+    "import_s": imported_at - started_at,
+    "first_request_s": time.perf_counter() - imported_at,
+}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules.append((int(cumulative_us), int(self_us), name))
+    modules.sort(reverse=True)
+    return modules
+
+
+def cold_start():
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        cwd=ROOT,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_s"] = time.perf_counter() - started_at
+    return timings
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+    modules = import_profile()
+    print(f"slowest imports (cumulative ms / self ms), top {top}:")
+    for cumulative_us, self_us, name in modules[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+    mongo = sorted(
+        name for _, _, name in modules if name.split(".")[0] in MONGO_PACKAGES
+    )
+    print(f"\nmongo driver modules loaded by import: {', '.join(mongo) or 'none'}")
+
+    samples = [cold_start() for _ in range(runs)]
+    print(f"\ncold start, median of {runs} fresh interpreters:")
+    for key in ("import_s", "first_request_s", "process_s"):
+        median = statistics.median(sample[key] for sample in samples)
+        print(f"  {key:<16} {median * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
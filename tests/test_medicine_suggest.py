@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+import pytest
+
+import app.core.medicine_suggest as medicine_suggest_module
+from app.core.medicine_suggest import MedicineSuggestIndex, trigrams
+
+
+def assert_consistent(index: MedicineSuggestIndex) -> None:
+    assert set(index._normalized) == set(index._entries)
+    assert set(index._entry_trigrams) == set(index._entries)
+    assert index._keys == sorted(index._keys)
+    expected_keys = set()
+    for medicine_id, normalized in index._normalized.items():
+        expected_keys |= index._entry_keys(medicine_id, normalized)
+    assert len(index._keys) == len(expected_keys)
+    assert set(index._keys) == expected_keys
+    postings = {}
+    for medicine_id, grams in index._entry_trigrams.items():
+        for gram in grams:
+            postings.setdefault(gram, set()).add(medicine_id)
+    assert index._trigrams == postings
+
+
+def ids(results):
+    return [result["medicine_id"] for result in results]
+
+
+@pytest.fixture
+def index():
+    index = MedicineSuggestIndex()
+    index.upsert(1, "Dolo 650", "Paracetamol")
+    index.upsert(2, "Crocin Advance", "Paracetamol 500 mg")
+    index.upsert(3, "Azithral 500", "Azithromycin")
+    index.upsert(4, "Pan-D", "Pantoprazole Domperidone")
+    return index
+
+
+def test_upsert_builds_consistent_index(index):
+    assert len(index) == 4
+    assert_consistent(index)
+
+
+def test_rename_drops_old_keys(index):
+    index.upsert(1, "Dolo 650 Tab", "Acetaminophen")
+    assert_consistent(index)
+    assert ids(index.suggest("para")) == [2]
+    assert ids(index.suggest("aceta")) == [1]
+    assert ids(index.suggest("tab")) == [1]
+    assert not any(
+        medicine_id == 1 and "paracetamol" in key for key, medicine_id in index._keys
+    )
+
+
+def test_delete_and_reinsert(index):
+    index.remove(3)
+    assert_consistent(index)
+    assert index.suggest("azi") == []
+    assert not any(3 in ids_ for ids_ in index._trigrams.values())
+    index.remove(3)
+    assert_consistent(index)
+    index.upsert(3, "Azithral 250", "Azithromycin")
+    assert_consistent(index)
+    assert ids(index.suggest("azithral")) == [3]
+    assert index.suggest("azithral")[0]["medicine_name"] == "Azithral 250"
+
+
+def test_unchanged_upsert_is_a_no_op(index):
+    keys = list(index._keys)
+    index.upsert(4, "Pan-D", "Pantoprazole Domperidone")
+    assert index._keys == keys
+    assert_consistent(index)
+
+
+def test_prefix_ranking(index):
+    # whole-name prefixes first, shorter names first; "500" only starts a
+    # later word of both names
+    index.upsert(5, "Paracip", "Paracetamol")
+    assert ids(index.suggest("para")) == [5, 1, 2]
+    assert ids(index.suggest("500")) == [3, 2]
+    assert ids(index.suggest("PAN d")) == [4]
+    assert ids(index.suggest("para", limit=2)) == [5, 1]
+
+
+def test_empty_query(index):
+    assert index.suggest("  -- ") == []
+
+
+def test_fuzzy_fill_for_misspellings(index):
+    # no prefix matches a misspelling; the trigram pass fills in
+    assert ids(index.suggest("azitromycin")) == [3]
+    assert ids(index.suggest("pantoprazol")) == [4]
+
+
+def test_fuzzy_fill_needs_three_characters(index):
+    index.COMMON_TRIGRAM_SHARE = 1.0
+    index.MIN_SIMILARITY = 0.3
+    # "ay" shares the padded "  a" with two entries, a third of its trigrams,
+    # but has no prefix match and is too short for the fuzzy pass
+    assert index.suggest("ay") == []
+    assert ids(index.suggest("azx")) == [3]
+
+
+def test_fuzzy_fill_skips_prefix_matches(index):
+    index.COMMON_TRIGRAM_SHARE = 1.0
+    # "paracetamol" prefix-matches 1 and 2, which the trigram pass would
+    # also find; each is listed once
+    assert ids(index.suggest("paracetamol")) == [1, 2]
+
+
+def test_trigrams_are_padded_like_pg_trgm():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+
+
+def test_rebuild_replays_notifications_onto_the_new_snapshot(index, monkeypatch):
+    class Result:
+        async def partitions(self):
+            yield [(1, "Dolo 650", "Paracetamol"), (2, "Crocin", "Paracetamol")]
+            # changes committed while the snapshot streams
+            index.handle_notification(json.dumps({"op": "delete", "id": 1}))
+            index.handle_notification(
+                json.dumps(
+                    {
+                        "op": "upsert",
+                        "id": 7,
+                        "name": "Calpol",
+                        "generic": "Paracetamol",
+                    }
+                )
+            )
+            assert index._pending is not None and len(index._pending) == 2
+            yield [(3, "Azithral 500", "Azithromycin")]
+
+    class Connection:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def stream(self, statement):
+            return Result()
+
+    class Engine:
+        def connect(self):
+            return Connection()
+
+    monkeypatch.setattr(medicine_suggest_module, "engine", Engine())
+    asyncio.run(index.rebuild())
+
+    assert index._pending is None
+    assert index._loaded
+    assert sorted(index._entries) == [2, 3, 7]
+    assert_consistent(index)
+    # the delete streamed in mid-build wins over the snapshot row, and the
+    # old index's medicine 4 is gone with it
+    assert index.suggest("dolo") == []
+    assert ids(index.suggest("para")) == [7, 2]
+    assert index.suggest("pan") == []
+
+
+def test_failed_rebuild_keeps_the_old_snapshot(index, monkeypatch):
+    class Engine:
+        def connect(self):
+            raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(medicine_suggest_module, "engine", Engine())
+    with pytest.raises(ConnectionError):
+        asyncio.run(index.rebuild())
+    assert index._pending is None
+    assert len(index) == 4
+    assert_consistent(index)
@@ -0,0 +1,115 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.inventory_management_models import Medicine
+from app.services.inventory_service import GST_SLAB_KEYSET, MEDICINE_KEYSET
+from app.services.order_management_service import ORDER_KEYSET
+from app.utils.pagination import Keyset, decode_cursor, encode_cursor
+
+CREATED_AT = datetime(2026, 10, 17, 9, 30, 15, 250000, tzinfo=timezone.utc)
+# medicines.created_at is a TIMESTAMP without time zone
+NAIVE_KEYSET = Keyset(Medicine.created_at, Medicine.medicine_id)
+
+
+def raw_cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def bound(keyset, cursor):
+    return [value.value for value in keyset.values(cursor)]
+
+
+def assert_rejected(keyset, cursor):
+    with pytest.raises(HTTPException) as error:
+        keyset.values(cursor)
+    assert error.value.status_code == 400
+    assert error.value.detail == "invalid cursor"
+
+
+def test_cursor_round_trip():
+    values = [CREATED_AT, 42, "3004", None]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == [CREATED_AT.isoformat(), 42, "3004", None]
+
+
+def test_keyset_values_round_trip():
+    assert bound(MEDICINE_KEYSET, encode_cursor([42])) == [42]
+    assert bound(GST_SLAB_KEYSET, encode_cursor(["3004"])) == ["3004"]
+    assert bound(ORDER_KEYSET, encode_cursor([CREATED_AT, 7])) == [CREATED_AT, 7]
+    ist = CREATED_AT.astimezone(timezone(timedelta(hours=5, minutes=30)))
+    assert bound(ORDER_KEYSET, encode_cursor([ist, 7])) == [ist, 7]
+    naive = CREATED_AT.replace(tzinfo=None)
+    assert bound(NAIVE_KEYSET, encode_cursor([naive, 7])) == [naive, 7]
+
+
+def test_keyset_values_keeps_integer_bounds():
+    assert bound(MEDICINE_KEYSET, encode_cursor([2**31 - 1])) == [2**31 - 1]
+    assert bound(MEDICINE_KEYSET, encode_cursor([-(2**31)])) == [-(2**31)]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        raw_cursor("{not json"),
+        raw_cursor('{"id": 1}'),
+        raw_cursor("42"),
+        "é",
+    ],
+)
+def test_malformed_cursor(cursor):
+    assert_rejected(MEDICINE_KEYSET, cursor)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [1, 2],
+        ["42"],
+        [4.2],
+        [None],
+        [True],
+        [False],
+        [2**31],
+        [-(2**31) - 1],
+        [99999999999],
+    ],
+)
+def test_tampered_integer_key(values):
+    assert_rejected(MEDICINE_KEYSET, encode_cursor(values))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2026-10-17T09:30:15", 7],
+        ["yesterday", 7],
+        [1760693415, 7],
+        [CREATED_AT.isoformat(), True],
+        [CREATED_AT.isoformat(), 2**40],
+        [CREATED_AT.isoformat()],
+    ],
+)
+def test_tampered_timestamp_key(values):
+    # created_at is TIMESTAMPTZ; a naive value would be read in the
+    # server's local zone
+    assert_rejected(ORDER_KEYSET, encode_cursor(values))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [[CREATED_AT.isoformat(), 7], ["2026-10-17T09:30:15+05:30", 7]],
+)
+def test_aware_value_for_naive_timestamp_key(values):
+    # asyncpg cannot encode an aware datetime as TIMESTAMP
+    assert_rejected(NAIVE_KEYSET, encode_cursor(values))
+
+
+@pytest.mark.parametrize("values", [[3004], ["x" * 256], [["3004"]]])
+def test_tampered_string_key(values):
+    assert_rejected(GST_SLAB_KEYSET, encode_cursor(values))